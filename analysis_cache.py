@@ -0,0 +1,135 @@
+"""
+Analysis Cache for BoataniQ
+Remembers AI analysis results by image content hash so that re-uploading the
+same photo skips the Vertex AI / Gemini round-trip
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import orjson
+
+
+class AnalysisCache:
+    """Thread-safe LRU of analysis results with an optional SQLite copy on disk"""
+
+    def __init__(self, maxsize: int = 512, db_path: str = None, disk_maxsize: int = 10000):
+        """
+        Initialize the cache
+
+        Args:
+            maxsize: Number of results kept in memory
+            db_path: Optional SQLite file so results survive restarts (shared by workers)
+            disk_maxsize: Number of results kept in the SQLite file
+        """
+        self.maxsize = maxsize
+        self.disk_maxsize = disk_maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> serialized result
+        self._lock = threading.Lock()
+        self._disk_writes = 0
+        self._db_path = db_path
+        self._db = None
+        self._db_pid = None
+        if db_path:
+            self._connection()
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """SQLite connection for this process (reopened after a fork, never shared)"""
+        if self._db_path is None:
+            return None
+        if self._db is not None and self._db_pid == os.getpid():
+            return self._db
+
+        try:
+            self._db = sqlite3.connect(self._db_path, timeout=5, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS analyses ('
+                'key TEXT PRIMARY KEY, result BLOB NOT NULL, created REAL NOT NULL)'
+            )
+            self._db.commit()
+            self._db_pid = os.getpid()
+        except sqlite3.Error as e:
+            print(f"⚠️ [CACHE] Persistent analysis cache disabled: {e}")
+            self._db = None
+            self._db_path = None
+        return self._db
+
+    @staticmethod
+    def make_key(image_bytes: bytes, namespace: str = '') -> str:
+        """Build a cache key from the image content (and analyzer, so models don't mix)"""
+        digest = hashlib.blake2b(image_bytes, digest_size=16)
+        digest.update(namespace.encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return a fresh copy of the cached result, or None"""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+            elif self._connection() is not None:
+                try:
+                    row = self._db.execute('SELECT result FROM analyses WHERE key = ?', (key,)).fetchone()
+                except sqlite3.Error:
+                    row = None
+                if row is not None:
+                    data = bytes(row[0])
+                    self._remember(key, data)
+
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        # Callers annotate the result (e.g. image_name), so never hand out the stored object
+        return orjson.loads(data)
+
+    def set(self, key: str, result: Dict):
+        """Store an analysis result"""
+        data = orjson.dumps(result, default=str, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+        with self._lock:
+            self._remember(key, data)
+
+            if self._connection() is not None:
+                try:
+                    self._db.execute(
+                        'INSERT OR REPLACE INTO analyses (key, result, created) VALUES (?, ?, ?)',
+                        (key, data, time.time())
+                    )
+                    self._disk_writes += 1
+                    if self._disk_writes % 100 == 0:
+                        self._db.execute(
+                            'DELETE FROM analyses WHERE key NOT IN '
+                            '(SELECT key FROM analyses ORDER BY created DESC LIMIT ?)',
+                            (self.disk_maxsize,)
+                        )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"⚠️ [CACHE] Error saving analysis to disk: {e}")
+
+    def _remember(self, key: str, data: bytes):
+        """Insert into the in-memory LRU (caller holds the lock)"""
+        self._entries[key] = data
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict:
+        """Get cache hit/miss statistics"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'persistent': self._db_path is not None
+            }
@@ -3,28 +3,62 @@ boataniQ App - Main Flask Application
 A boat recognition and analysis application using AI and database matching
 """
 
-from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, send_from_directory
+from flask import Flask, render_template, request, redirect, url_for, flash, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import os
+import re
 import uuid
 import pandas as pd
-import json
+import numpy as np
+import orjson
 import datetime
-from werkzeug.utils import secure_filename
+import collections
+import concurrent.futures
+import threading
+import queue
+import time
+import atexit
+import functools
+import logging
+import gzip
+import hashlib
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
 from dotenv import load_dotenv
 
-from boat_database import BoatDatabase
-from boat_ai_analyzer import BoatAIAnalyzer
-from boat_vertex_ai_analyzer import BoatVertexAIAnalyzer
-from boat_location_analyzer import BoatLocationAnalyzer
+from boat_database import BoatDatabase, narrow_array
 from image_preprocessor import ImagePreprocessor
-from financial_indices_fetcher import FinancialIndicesFetcher
-from boat_market_analyzer import BoatMarketAnalyzer
+from analysis_cache import AnalysisCache
+# The analyzer and fetcher modules pull in heavy SDKs (Vertex AI, Gemini,
+# yfinance) and are imported lazily where they are first needed
 
 # Load environment variables
 load_dotenv()
 
+# Request tracing goes through logging so it can be silenced with LOG_LEVEL
+logging.basicConfig(level=os.getenv('LOG_LEVEL', 'INFO').upper())
+logger = logging.getLogger(__name__)
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (numpy scalars/arrays, non-str keys)"""
+
+    # Never indent or sort keys; ORJSON_OPTIONS deliberately omits OPT_INDENT_2/OPT_SORT_KEYS
+    compact = True
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=str, option=ORJSON_OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'your-secret-key-here')
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
@@ -32,43 +66,289 @@ app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 # Enable CORS
 CORS(app)
 
+def fast_jsonify(obj, status=200):
+    """Build a JSON response with orjson (handles numpy, datetime and NaN)"""
+    return app.response_class(orjson.dumps(obj, default=str, option=ORJSON_OPTIONS),
+                              status=status, mimetype='application/json')
+
 # Initialize components
 boat_db = None
 ai_analyzer = None
 location_analyzer = None
 image_preprocessor = ImagePreprocessor()
-financial_fetcher = FinancialIndicesFetcher()
+# Repeat uploads of the same (preprocessed) image reuse the earlier AI analysis
+analysis_cache = AnalysisCache(maxsize=512, db_path=os.getenv('ANALYSIS_CACHE_DB', 'analysis_cache.sqlite3'))
+financial_fetcher = None
+financial_fetcher_lock = threading.Lock()
 boat_market_analyzer = None
+search_pool = None
+search_pool_lock = threading.Lock()
+SEARCH_POOL_WORKERS = 8
 
-# Analysis history storage
-HISTORY_FILE = 'analysis_history.json'
+def get_financial_fetcher():
+    """Create the financial indices fetcher on first use"""
+    global financial_fetcher
+    
+    if financial_fetcher is None:
+        with financial_fetcher_lock:
+            if financial_fetcher is None:
+                from financial_indices_fetcher import FinancialIndicesFetcher
+                financial_fetcher = FinancialIndicesFetcher()
+    return financial_fetcher
+
+def get_search_pool():
+    """Shared thread pool for independent database lookups within one request
+    
+    Created on first use rather than at import, so gunicorn --preload workers
+    don't inherit a pool whose threads only exist in the master.
+    """
+    global search_pool
+    
+    if search_pool is None:
+        with search_pool_lock:
+            if search_pool is None:
+                search_pool = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=SEARCH_POOL_WORKERS, thread_name_prefix='boat-search'
+                )
+    return search_pool
+
+# Analysis history storage (append-only JSON Lines, oldest entry first).
+# The file is shared by every gunicorn worker and is the source of truth; each
+# process only keeps what it has queued but not yet written.
+HISTORY_FILE = 'analysis_history.jsonl'
+LEGACY_HISTORY_FILE = 'analysis_history.json'
+HISTORY_LIMIT = 50
+HISTORY_COMPACT_EVERY = 100  # Compact the file after this many appends from one process
+HISTORY_FLUSH_INTERVAL = 0.05  # Seconds the writer waits to coalesce a batch
+HISTORY_FSYNC = os.getenv('HISTORY_FSYNC', 'false').lower() == 'true'
+
+HISTORY_PENDING = {}  # id -> entry queued by this process, not yet on disk
+HISTORY_PENDING_DELETES = set()  # ids whose delete marker is not yet on disk
+history_lock = threading.Lock()
+history_writes = 0
+history_file_state = None  # (signature, entries newest first, id -> entry) of the last parse
+
+# Disk writes happen on a background thread; handlers only enqueue.
+# Items are history entries (or {'deleted_id': ...} markers) to append,
+# HISTORY_COMPACT to compact the file, or None to stop the writer.
+HISTORY_QUEUE = queue.Queue()
+HISTORY_COMPACT = 'compact'
+history_writer_thread = None
+
+def lock_history_file(history_file, exclusive=False):
+    """flock the history file so appends and compactions from other workers don't interleave"""
+    if fcntl is not None:
+        fcntl.flock(history_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+def unlock_history_file(history_file):
+    """Release a lock taken with lock_history_file on a handle that stays open"""
+    if fcntl is not None:
+        fcntl.flock(history_file, fcntl.LOCK_UN)
+
+def parse_history_lines(history_file):
+    """Live entries (oldest first, deleted ones dropped) and the number of stored lines"""
+    entries = []
+    deleted_ids = set()
+    stored_lines = 0
+    for line in history_file:
+        line = line.strip()
+        if not line:
+            continue
+        stored_lines += 1
+        try:
+            record = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            # Skip a partially written line (e.g. after a crash)
+            continue
+        if 'deleted_id' in record:
+            deleted_ids.add(record['deleted_id'])
+        else:
+            entries.append(record)
+    return [entry for entry in entries if entry.get('id') not in deleted_ids], stored_lines
+
+def read_history_file():
+    """Entries on disk (newest first) and their id index, re-parsed only when the file changes"""
+    global history_file_state
+    
+    try:
+        with open(HISTORY_FILE, 'rb') as f:
+            lock_history_file(f)
+            stat = os.fstat(f.fileno())
+            signature = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            state = history_file_state
+            if state is not None and state[0] == signature:
+                return state[1], state[2]
+            entries, _ = parse_history_lines(f)
+    except FileNotFoundError:
+        return [], {}
+    
+    entries.reverse()
+    by_id = {entry.get('id'): entry for entry in entries}
+    history_file_state = (signature, entries, by_id)
+    return entries, by_id
+
+def current_history():
+    """Most recent entries across all workers, including this process's unflushed writes"""
+    entries, _ = read_history_file()
+    with history_lock:
+        pending = list(HISTORY_PENDING.values())
+        deleted_ids = set(HISTORY_PENDING_DELETES)
+    if pending or deleted_ids:
+        pending_ids = {entry['id'] for entry in pending}
+        entries = pending[::-1] + [entry for entry in entries if entry.get('id') not in pending_ids]
+        entries = [entry for entry in entries if entry.get('id') not in deleted_ids]
+    return entries[:HISTORY_LIMIT]
+
+def find_history_entry(history_id):
+    """Entry with this id, whichever worker wrote it, or None"""
+    with history_lock:
+        if history_id in HISTORY_PENDING_DELETES:
+            return None
+        entry = HISTORY_PENDING.get(history_id)
+    if entry is None:
+        entry = read_history_file()[1].get(history_id)
+    return entry
 
 def load_analysis_history():
-    """Load analysis history from JSON file"""
+    """Migrate the legacy JSON history and compact the JSONL file if it needs it"""
     if os.path.exists(HISTORY_FILE):
         try:
-            with open(HISTORY_FILE, 'r') as f:
-                return json.load(f)
+            with open(HISTORY_FILE, 'rb') as f:
+                lock_history_file(f)
+                entries, stored_lines = parse_history_lines(f)
+        except Exception as e:
+            logger.error("Error loading history: %s", e)
+            return
+        # Drops delete markers and trimmed entries from the file
+        if stored_lines != min(len(entries), HISTORY_LIMIT):
+            with history_lock:
+                compact_analysis_history()
+    elif os.path.exists(LEGACY_HISTORY_FILE):
+        # Migrate the old read-modify-write JSON list (most recent first)
+        try:
+            with open(LEGACY_HISTORY_FILE, 'rb') as f:
+                legacy = orjson.loads(f.read())[:HISTORY_LIMIT]
         except Exception as e:
-            print(f"Error loading history: {e}")
-            return []
-    return []
+            logger.error("Error loading legacy history: %s", e)
+            return
+        with history_lock:
+            for entry in reversed(legacy):
+                HISTORY_PENDING[entry.get('id')] = entry
+                HISTORY_QUEUE.put(entry)
 
-def save_analysis_history(history):
-    """Save analysis history to JSON file"""
+def compact_analysis_history():
+    """Queue a compaction of the JSONL file (caller holds history_lock)"""
+    global history_writes
+    
+    HISTORY_QUEUE.put(HISTORY_COMPACT)
+    history_writes = 0
+
+def compact_history_file(history_file):
+    """Rewrite the file with its newest HISTORY_LIMIT live entries (caller holds the exclusive flock)
+
+    Re-reads the file instead of trusting this process's view, so entries and
+    delete markers appended by other workers survive the rewrite.
+    """
+    history_file.seek(0)
+    entries, _ = parse_history_lines(history_file)
+    lines = [orjson.dumps(entry, default=str, option=ORJSON_OPTIONS) + b'\n' for entry in entries[-HISTORY_LIMIT:]]
+    # Truncate in place so every worker's append handle keeps pointing at the same file
+    history_file.truncate(0)
+    history_file.write(b''.join(lines))
+
+def history_writer():
+    """Write queued history entries to disk in coalesced batches"""
     try:
-        with open(HISTORY_FILE, 'w') as f:
-            json.dump(history, f, indent=2, default=str)
+        history_file = open(HISTORY_FILE, 'a+b')
     except Exception as e:
-        print(f"Error saving history: {e}")
+        logger.error("Error opening history file: %s", e)
+        history_file = None
+    
+    running = True
+    while running:
+        batch = [HISTORY_QUEUE.get()]
+        if batch[0] is not None:
+            time.sleep(HISTORY_FLUSH_INTERVAL)
+        try:
+            while True:
+                batch.append(HISTORY_QUEUE.get_nowait())
+        except queue.Empty:
+            pass
+        
+        compact = False
+        records = []
+        for item in batch:
+            if item is None:
+                running = False
+                break
+            if item == HISTORY_COMPACT:
+                compact = True
+            else:
+                records.append(item)
+        
+        if history_file is None or not (compact or records):
+            continue
+        try:
+            lock_history_file(history_file, exclusive=True)
+            try:
+                history_file.write(b''.join(
+                    orjson.dumps(record, default=str, option=ORJSON_OPTIONS) + b'\n' for record in records
+                ))
+                if compact:
+                    compact_history_file(history_file)
+                history_file.flush()
+                if HISTORY_FSYNC:
+                    os.fsync(history_file.fileno())
+            finally:
+                unlock_history_file(history_file)
+        except Exception as e:
+            logger.error("Error saving history: %s", e)
+            continue
+        
+        # Written records are now visible to every worker through the file
+        with history_lock:
+            for record in records:
+                if 'deleted_id' in record:
+                    HISTORY_PENDING_DELETES.discard(record['deleted_id'])
+                elif HISTORY_PENDING.get(record.get('id')) is record:
+                    del HISTORY_PENDING[record['id']]
+    
+    if history_file is not None:
+        history_file.close()
+
+def start_history_writer():
+    """Start the background history writer thread"""
+    global history_writer_thread
+    
+    history_writer_thread = threading.Thread(target=history_writer, name='history-writer', daemon=True)
+    history_writer_thread.start()
+
+def stop_history_writer():
+    """Drain pending history writes before the process exits"""
+    if history_writer_thread is not None and history_writer_thread.is_alive():
+        HISTORY_QUEUE.put(None)
+        history_writer_thread.join(timeout=5)
+
+HISTORY_ID_BATCH = 256
+history_id_pool = collections.deque()  # 16-byte random chunks for upcoming ids
+
+def new_history_id():
+    """UUID4-formatted id cut from a batch of random bytes (one urandom call per batch)"""
+    try:
+        raw = history_id_pool.popleft()
+    except IndexError:
+        entropy = os.urandom(16 * HISTORY_ID_BATCH)
+        history_id_pool.extend(entropy[i:i + 16] for i in range(0, len(entropy), 16))
+        raw = history_id_pool.popleft()
+    return str(uuid.UUID(bytes=raw, version=4))
 
 def add_analysis_to_history(analysis_data):
     """Add new analysis to history"""
-    history = load_analysis_history()
+    global history_writes
     
     # Create history entry
     history_entry = {
-        'id': str(uuid.uuid4()),
+        'id': new_history_id(),
         'timestamp': datetime.datetime.now().isoformat(),
         'boat_type': analysis_data.get('boat_type', 'Unknown'),
         'brand': analysis_data.get('brand', 'Unknown'),
@@ -79,16 +359,188 @@ def add_analysis_to_history(analysis_data):
         'analysis': analysis_data
     }
     
-    # Add to beginning of history (most recent first)
-    history.insert(0, history_entry)
-    
-    # Keep only last 50 analyses
-    if len(history) > 50:
-        history = history[:50]
+    with history_lock:
+        HISTORY_PENDING[history_entry['id']] = history_entry
+        HISTORY_QUEUE.put(history_entry)
+        history_writes += 1
+        # Keep the file trimmed to the most recent entries
+        if history_writes >= HISTORY_COMPACT_EVERY:
+            compact_analysis_history()
     
-    save_analysis_history(history)
     return history_entry
 
+def restart_history_writer_after_fork():
+    """Give a forked worker (gunicorn --preload) its own queue, writer thread and ids"""
+    global HISTORY_QUEUE, HISTORY_PENDING, HISTORY_PENDING_DELETES, history_lock
+    
+    HISTORY_QUEUE = queue.Queue()
+    # The parent's writer flushes what it had queued; the child only tracks its own
+    # writes (and gets a fresh lock in case a parent thread held it across the fork)
+    HISTORY_PENDING = {}
+    HISTORY_PENDING_DELETES = set()
+    history_lock = threading.Lock()
+    # Random bytes inherited from the parent would hand out the same ids twice
+    history_id_pool.clear()
+    start_history_writer()
+
+load_analysis_history()
+start_history_writer()
+atexit.register(stop_history_writer)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=restart_history_writer_after_fork)
+
+# Pre-serialized bodies for endpoints that only depend on boats_df
+FILTER_OPTIONS_BYTES = None
+STATS_BYTES = None
+BRAND_COUNT = None
+MAP_BOATS_LIMITS = (100, 500, 1000)  # Limits the map page asks for; others are built per request
+MAP_BOATS_PAYLOADS = {}
+MARKET_ANALYZER_ERROR_BYTES = None  # Body returned while boat_market_analyzer is None
+
+def build_cached_payload(obj, compress=True):
+    """Serialize obj once into a body, a gzip body and an ETag
+
+    With compress=False the gzip body is left as None and compressed per
+    response, only when the client accepts it (for payloads that aren't reused).
+    """
+    body = orjson.dumps(obj, default=str, option=ORJSON_OPTIONS)
+    return {
+        'body': body,
+        'gzip': gzip.compress(body, compresslevel=6) if compress else None,
+        'etag': hashlib.blake2b(body, digest_size=16).hexdigest()
+    }
+
+def cached_json_response(payload, max_age=3600):
+    """Serve a pre-serialized payload with ETag revalidation and gzip when accepted"""
+    if request.if_none_match.contains_weak(payload['etag']):
+        response = app.response_class(status=304)
+    elif request.accept_encodings['gzip']:
+        compressed = payload['gzip']
+        if compressed is None:
+            compressed = gzip.compress(payload['body'], compresslevel=6)
+        response = app.response_class(compressed, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = app.response_class(payload['body'], mimetype='application/json')
+    
+    # Weak ETag: the gzip and identity bodies are the same resource
+    response.set_etag(payload['etag'], weak=True)
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    return response
+
+# GET endpoints whose bodies only depend on boats_df; they carry Last-Modified and
+# answer If-Modified-Since with 304 before the view runs
+BOAT_DATA_ENDPOINTS = frozenset({
+    'get_filter_options', 'get_stats', 'get_boats_for_map',
+    'get_data_insights_summary', 'get_price_distribution', 'get_year_distribution',
+    'get_brand_stats', 'get_size_distribution', 'get_market_trends', 'get_data_insights_bundle',
+    'get_boat_market_performance',
+})
+
+def boat_data_last_modified():
+    """Last-Modified for BOAT_DATA_ENDPOINTS, or None outside them or before the data loads"""
+    if request.method != 'GET' or request.endpoint not in BOAT_DATA_ENDPOINTS or boat_db is None:
+        return None
+    return boat_db.last_modified
+
+@app.before_request
+def short_circuit_not_modified():
+    """Answer a conditional GET with 304 when the boat data is unchanged since If-Modified-Since"""
+    # If-None-Match takes precedence and If-Modified-Since must then be ignored
+    # (RFC 9110 section 13.1.3); the view validates the ETag itself
+    if 'If-None-Match' in request.headers:
+        return None
+    last_modified = boat_data_last_modified()
+    if last_modified is not None and request.if_modified_since and request.if_modified_since >= last_modified:
+        response = app.response_class(status=304)
+        response.last_modified = last_modified
+        return response
+
+@app.after_request
+def stamp_last_modified(response):
+    """Tag successful boat-data responses with the time the data was loaded"""
+    if response.status_code == 200:
+        last_modified = boat_data_last_modified()
+        if last_modified is not None:
+            response.last_modified = last_modified
+    return response
+
+def count_unique_brands():
+    """Count distinct first words of boat titles (used as the brand)"""
+    return len(boat_db.boats_df['title'].str.extract(r'^\s*(\S+)', expand=False).unique())
+
+def map_boats_payload(boats):
+    """Build the /api/map/boats response body"""
+    return {
+        'success': True,
+        'boats': boats,
+        'count': len(boats)
+    }
+
+def build_stats():
+    """Build the database statistics shown on the main page"""
+    return {
+        'total_boats': len(boat_db.boats_df),
+        'unique_brands': BRAND_COUNT if BRAND_COUNT is not None else count_unique_brands(),
+        'year_range': {
+            'min': 'N/A',
+            'max': 'N/A'
+        },
+        'price_range': {
+            'min': 'N/A',
+            'max': 'N/A'
+        }
+    }
+
+def market_analyzer_error_message():
+    """Explain why boat_market_analyzer is not available"""
+    error_msg = 'Boat market analyzer not available. '
+    if boat_db is None:
+        error_msg += 'Boat database not initialized.'
+    elif boat_db.boats_df is None or len(boat_db.boats_df) == 0:
+        error_msg += 'No boat data available in database.'
+    else:
+        error_msg += 'Initialization failed.'
+    return error_msg
+
+def market_analyzer_unavailable():
+    """500 response for the investment-comparison endpoints when the market analyzer is missing"""
+    body = MARKET_ANALYZER_ERROR_BYTES
+    if body is None:
+        body = orjson.dumps({'error': market_analyzer_error_message()})
+    return app.response_class(body, status=500, mimetype='application/json')
+
+def refresh_response_cache():
+    """Recompute cached filter options and stats (call again whenever boat_db is reloaded)"""
+    global FILTER_OPTIONS_BYTES, STATS_BYTES, BRAND_COUNT, MAP_BOATS_PAYLOADS, MARKET_ANALYZER_ERROR_BYTES
+    
+    MARKET_ANALYZER_ERROR_BYTES = orjson.dumps({'error': market_analyzer_error_message()})
+    FILTER_OPTIONS_BYTES = None
+    STATS_BYTES = None
+    BRAND_COUNT = None
+    MAP_BOATS_PAYLOADS = {}
+    if boat_db is None:
+        return
+    
+    try:
+        BRAND_COUNT = count_unique_brands()
+        FILTER_OPTIONS_BYTES = orjson.dumps(boat_db.get_filter_options(), default=str, option=ORJSON_OPTIONS)
+        STATS_BYTES = orjson.dumps({'success': True, 'stats': build_stats()}, default=str, option=ORJSON_OPTIONS)
+        logger.info("Filter options and stats cached")
+    except Exception as e:
+        logger.error("Response cache refresh failed: %s", e)
+    
+    try:
+        MAP_BOATS_PAYLOADS = {
+            limit: build_cached_payload(map_boats_payload(boat_db.get_boats_for_map(limit)))
+            for limit in MAP_BOATS_LIMITS
+        }
+        logger.info("Map payloads cached for limits %s", ', '.join(map(str, MAP_BOATS_LIMITS)))
+    except Exception as e:
+        logger.error("Map payload cache failed: %s", e)
+
 def initialize_app():
     """Initialize the application components"""
     global boat_db, ai_analyzer, location_analyzer, boat_market_analyzer
@@ -98,24 +550,21 @@ def initialize_app():
         csv_path = 'all_boats_data.csv'
         json_dir = 'json_boat24' if os.path.exists('json_boat24') else None  # Make JSON dir optional
         
-        print(f"🔍 [INIT] Checking for database file: {csv_path}")
-        print(f"   CSV exists: {os.path.exists(csv_path)}")
+        logger.debug("[INIT] Checking for database file: %s (exists: %s)", csv_path, os.path.exists(csv_path))
         if csv_path and os.path.exists(csv_path):
             try:
                 boat_db = BoatDatabase(csv_path, json_dir)
                 if boat_db and boat_db.boats_df is not None:
-                    print(f"✅ Database initialized with {len(boat_db.boats_df)} boats")
+                    logger.info("Database initialized with %d boats", len(boat_db.boats_df))
                 else:
-                    print(f"❌ Database initialized but boats_df is None")
+                    logger.error("Database initialized but boats_df is None")
                     boat_db = None
             except Exception as db_error:
-                print(f"❌ Database initialization failed: {db_error}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("Database initialization failed: %s", db_error)
                 boat_db = None
         else:
-            print(f"❌ Warning: CSV file {csv_path} not found at current directory: {os.getcwd()}")
-            print(f"   Files in current directory: {os.listdir('.')[:10]}")
+            logger.error("CSV file %s not found at current directory: %s (files: %s)",
+                         csv_path, os.getcwd(), os.listdir('.')[:10])
             boat_db = None
         
         # Initialize AI analyzer - try Vertex AI first, then fallback to regular Gemini
@@ -127,117 +576,132 @@ def initialize_app():
             gcp_credentials_json = os.getenv('GCP_CREDENTIALS_JSON')
             credentials_path = os.getenv('GCP_CREDENTIALS_PATH', 'static-chiller-472906-f3-4ee4a099f2f1.json')
             
-            print(f"🔍 [INIT] Checking for GCP credentials...")
-            print(f"   GCP_CREDENTIALS_JSON exists: {bool(gcp_credentials_json)}")
-            print(f"   Credentials path exists: {os.path.exists(credentials_path) if credentials_path else False}")
+            logger.debug("[INIT] Checking for GCP credentials (GCP_CREDENTIALS_JSON set: %s, credentials path exists: %s)",
+                         bool(gcp_credentials_json), os.path.exists(credentials_path) if credentials_path else False)
+            
+            if gcp_credentials_json or os.path.exists(credentials_path):
+                from boat_vertex_ai_analyzer import BoatVertexAIAnalyzer
             
             if gcp_credentials_json:
                 # Clean the JSON string (remove any extra whitespace/newlines)
                 gcp_credentials_json = gcp_credentials_json.strip()
                 # Try to parse it to validate
                 try:
-                    import json
-                    json.loads(gcp_credentials_json)  # Validate JSON
+                    # Parse once: the analyzer takes the dict, so the JSON isn't decoded twice
+                    credentials_dict = orjson.loads(gcp_credentials_json)
                     # Use credentials from environment variable (JSON string)
-                    ai_analyzer = BoatVertexAIAnalyzer(credentials_json=gcp_credentials_json)
-                    print("✅ Vertex AI analyzer initialized successfully from environment variable (Gemini Flash 2.0)")
-                except json.JSONDecodeError as je:
-                    print(f"❌ [INIT] Invalid JSON in GCP_CREDENTIALS_JSON: {je}")
-                    print("   Trying file path...")
+                    ai_analyzer = BoatVertexAIAnalyzer(credentials_dict=credentials_dict)
+                    logger.info("Vertex AI analyzer initialized from environment variable (Gemini Flash 2.0)")
+                except orjson.JSONDecodeError as je:
+                    logger.error("[INIT] Invalid JSON in GCP_CREDENTIALS_JSON: %s; trying file path", je)
                     if os.path.exists(credentials_path):
                         ai_analyzer = BoatVertexAIAnalyzer(credentials_path=credentials_path)
-                        print("✅ Vertex AI analyzer initialized successfully from file (Gemini Flash 2.0)")
+                        logger.info("Vertex AI analyzer initialized from file (Gemini Flash 2.0)")
                 except Exception as ve:
-                    print(f"❌ [INIT] Vertex AI initialization error: {ve}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.exception("[INIT] Vertex AI initialization error: %s", ve)
             elif os.path.exists(credentials_path):
                 # Use credentials from file (local development)
                 ai_analyzer = BoatVertexAIAnalyzer(credentials_path=credentials_path)
-                print("✅ Vertex AI analyzer initialized successfully from file (Gemini Flash 2.0)")
+                logger.info("Vertex AI analyzer initialized from file (Gemini Flash 2.0)")
             else:
-                print("⚠️  Vertex AI credentials not found, trying regular Gemini...")
+                logger.warning("Vertex AI credentials not found, trying regular Gemini")
         except Exception as e:
-            print(f"⚠️  Vertex AI initialization failed: {e}")
-            import traceback
-            traceback.print_exc()
-            print("   Trying regular Gemini API...")
+            logger.exception("Vertex AI initialization failed: %s; trying regular Gemini API", e)
         
         # Fallback to regular Gemini API
         if ai_analyzer is None:
             api_key = os.getenv('GEMINI_API_KEY')
             if api_key:
                 try:
+                    from boat_ai_analyzer import BoatAIAnalyzer
                     ai_analyzer = BoatAIAnalyzer(api_key)
-                    print("✅ Regular Gemini analyzer initialized successfully")
+                    logger.info("Regular Gemini analyzer initialized")
                 except Exception as e:
-                    print(f"❌ Regular Gemini initialization failed: {e}")
+                    logger.error("Regular Gemini initialization failed: %s", e)
                     ai_analyzer = None
             else:
-                print("⚠️  GEMINI_API_KEY not found in environment variables")
+                logger.warning("GEMINI_API_KEY not found in environment variables")
                 ai_analyzer = None
         
         # Initialize Location analyzer
         try:
+            from boat_location_analyzer import BoatLocationAnalyzer
             location_analyzer = BoatLocationAnalyzer()
-            print("✅ Location analyzer initialized successfully")
+            logger.info("Location analyzer initialized")
         except Exception as e:
-            print(f"❌ Location analyzer initialization failed: {e}")
+            logger.error("Location analyzer initialization failed: %s", e)
             location_analyzer = None
         
         # Initialize Boat Market Analyzer
         boat_market_analyzer = None
         try:
             if boat_db and boat_db.boats_df is not None and len(boat_db.boats_df) > 0:
+                from boat_market_analyzer import BoatMarketAnalyzer
                 boat_market_analyzer = BoatMarketAnalyzer(boat_db.boats_df)
-                print(f"✅ Boat market analyzer initialized successfully with {len(boat_db.boats_df)} boats")
+                logger.info("Boat market analyzer initialized with %d boats", len(boat_db.boats_df))
             else:
-                print("⚠️  Boat market analyzer not initialized: No boat data available")
+                logger.warning("Boat market analyzer not initialized: no boat data available")
                 boat_market_analyzer = None
         except Exception as e:
-            print(f"❌ Boat market analyzer initialization failed: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Boat market analyzer initialization failed: %s", e)
             boat_market_analyzer = None
+        
+        # Precompute responses that only depend on the boat data
+        refresh_response_cache()
             
     except Exception as e:
-        print(f"Error initializing app: {e}")
+        logger.exception("Error initializing app: %s", e)
 
 # Create upload directory
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
 
+ALLOWED_FILE_RE = re.compile(r'\.(?:%s)\Z' % '|'.join(sorted(ALLOWED_EXTENSIONS)), re.IGNORECASE)
+
 def allowed_file(filename):
     """Check if file extension is allowed"""
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return ALLOWED_FILE_RE.search(filename) is not None
+
+FLOAT_TYPES = (float, np.floating)
+
+def parse_confidence(value, default=0):
+    """Return an AI confidence value as a number (models sometimes send strings)"""
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return default
+    return default
+
+def analyze_bytes_cached(image_bytes):
+    """AI analysis of an image, reusing the stored result for identical bytes (errors are not cached)"""
+    cache_key = AnalysisCache.make_key(image_bytes, type(ai_analyzer).__name__)
+    analysis_result = analysis_cache.get(cache_key)
+    if analysis_result is not None:
+        logger.info("[ANALYZE] Reusing cached analysis for identical image")
+        return analysis_result
+    
+    analysis_result = ai_analyzer.analyze_boat_image_from_bytes(image_bytes)
+    if 'error' not in analysis_result:
+        analysis_cache.set(cache_key, analysis_result)
+    return analysis_result
 
 def clean_boat_data_for_json(boats):
     """Clean NaN values from boat data for JSON serialization"""
-    cleaned_boats = []
-    for boat in boats:
-        cleaned_boat = {}
-        for key, value in boat.items():
-            if pd.isna(value) or value is None or str(value).lower() == 'nan':
-                cleaned_boat[key] = None
-            else:
-                cleaned_boat[key] = value
-        cleaned_boats.append(cleaned_boat)
-    return cleaned_boats
+    clean = clean_single_boat_data
+    return [clean(boat) for boat in boats]
 
 def clean_single_boat_data(boat_data):
     """Clean a single boat data dictionary for JSON serialization"""
     if not boat_data:
         return None
     
-    cleaned_boat = {}
-    for key, value in boat_data.items():
-        if pd.isna(value) or value is None or str(value).lower() == 'nan':
-            cleaned_boat[key] = None
-        else:
-            cleaned_boat[key] = value
-    return cleaned_boat
+    # String NaNs are turned into real NaN at CSV load, so a float self-compare is enough
+    return {key: None if isinstance(value, FLOAT_TYPES) and value != value else value
+            for key, value in boat_data.items()}
 
 @app.route('/')
 def index():
@@ -268,26 +732,18 @@ def investment_comparison():
 def upload_file():
     """Handle file upload and analysis"""
     if 'file' not in request.files:
-        return jsonify({'error': 'No file uploaded'}), 400
+        return fast_jsonify({'error': 'No file uploaded'}, 400)
     
     file = request.files['file']
     
     if file.filename == '':
-        return jsonify({'error': 'No file selected'}), 400
+        return fast_jsonify({'error': 'No file selected'}, 400)
     
     if file and allowed_file(file.filename):
         try:
-            # Generate unique filename
-            filename = secure_filename(file.filename)
-            unique_filename = f"{uuid.uuid4()}_{filename}"
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-            
-            # Save file
-            file.save(filepath)
-            
-            # Analyze the image
+            # Analyze the image straight from the upload; the analyzer takes bytes
             if ai_analyzer:
-                analysis_result = ai_analyzer.analyze_boat_image(filepath)
+                analysis_result = analyze_bytes_cached(file.read())
                 
                 # Find similar boats
                 similar_boats = []
@@ -297,10 +753,7 @@ def upload_file():
                 # Generate summary
                 summary = ai_analyzer.get_analysis_summary(analysis_result)
                 
-                # Clean up uploaded file
-                os.remove(filepath)
-                
-                return jsonify({
+                return fast_jsonify({
                     'success': True,
                     'analysis': analysis_result,
                     'summary': summary,
@@ -308,27 +761,24 @@ def upload_file():
                     'total_similar': len(similar_boats)
                 })
             else:
-                return jsonify({'error': 'AI analyzer not available'}), 500
+                return fast_jsonify({'error': 'AI analyzer not available'}, 500)
                 
         except Exception as e:
-            # Clean up file on error
-            if os.path.exists(filepath):
-                os.remove(filepath)
-            return jsonify({'error': f'Error processing image: {str(e)}'}), 500
+            return fast_jsonify({'error': f'Error processing image: {str(e)}'}, 500)
     
-    return jsonify({'error': 'Invalid file type'}), 400
+    return fast_jsonify({'error': 'Invalid file type'}, 400)
 
 @app.route('/api/search', methods=['GET'])
 def search_boats():
     """Search boats by various criteria"""
     if not boat_db:
-        return jsonify({'error': 'Database not available'}), 500
+        return fast_jsonify({'error': 'Database not available'}, 500)
     
     search_type = request.args.get('type', 'all')
     query = request.args.get('q', '')
     limit = int(request.args.get('limit', 10))
     
-    print(f"🔍 [SEARCH] Query: '{query}', Type: {search_type}, Limit: {limit}")
+    logger.debug("[SEARCH] Query: '%s', Type: %s, Limit: %d", query, search_type, limit)
     
     try:
         if search_type == 'brand':
@@ -345,30 +795,33 @@ def search_boats():
         # Clean results for JSON serialization
         cleaned_results = clean_boat_data_for_json(results)
         
-        print(f"✅ [SEARCH] Found {len(cleaned_results)} results")
+        logger.debug("[SEARCH] Found %d results", len(cleaned_results))
         
-        return jsonify({
+        return fast_jsonify({
             'success': True,
             'results': cleaned_results,
             'total': len(cleaned_results)
         })
         
     except Exception as e:
-        return jsonify({'error': f'Search error: {str(e)}'}), 500
+        return fast_jsonify({'error': f'Search error: {str(e)}'}, 500)
 
 @app.route('/api/filter-options', methods=['GET'])
 def get_filter_options():
     """Get available filter options for the UI"""
     try:
         if boat_db is None:
-            return jsonify({'error': 'Database not available'}), 500
+            return fast_jsonify({'error': 'Database not available'}, 500)
+        
+        if FILTER_OPTIONS_BYTES is not None:
+            return app.response_class(FILTER_OPTIONS_BYTES, mimetype='application/json')
         
         options = boat_db.get_filter_options()
-        return jsonify(options)
+        return fast_jsonify(options)
         
     except Exception as e:
-        print(f"❌ Filter options error: {str(e)}")
-        return jsonify({'error': f'Failed to get filter options: {str(e)}'}), 500
+        logger.error("Filter options error: %s", e)
+        return fast_jsonify({'error': f'Failed to get filter options: {str(e)}'}, 500)
 
 @app.route('/api/search-filtered', methods=['POST'])
 def search_with_filters():
@@ -379,20 +832,20 @@ def search_with_filters():
         filters = data.get('filters', {})
         limit = data.get('limit', 20)
         
-        print(f"🔍 FILTERED SEARCH: '{keywords}', filters: {filters}")
+        logger.debug("[FILTERED SEARCH] Keywords: '%s', filters: %s", keywords, filters)
         
         if boat_db is None:
-            return jsonify({'error': 'Database not available'}), 500
+            return fast_jsonify({'error': 'Database not available'}, 500)
         
         # Use the new filtered search method
         results = boat_db.search_with_filters(keywords, filters, limit)
         
-        print(f"✅ Found {len(results)} filtered results")
+        logger.debug("[FILTERED SEARCH] Found %d results", len(results))
         
         # Clean the data for JSON serialization
         cleaned_results = [clean_single_boat_data(boat) for boat in results]
         
-        return jsonify({
+        return fast_jsonify({
             'results': cleaned_results,
             'count': len(cleaned_results),
             'keywords': keywords,
@@ -400,36 +853,28 @@ def search_with_filters():
         })
         
     except Exception as e:
-        print(f"❌ Filtered search error: {str(e)}")
-        return jsonify({'error': f'Filtered search failed: {str(e)}'}), 500
+        logger.error("Filtered search error: %s", e)
+        return fast_jsonify({'error': f'Filtered search failed: {str(e)}'}, 500)
 
 @app.route('/api/stats')
 def get_stats():
     """Get database statistics"""
     if not boat_db:
-        return jsonify({'error': 'Database not available'}), 500
+        return fast_jsonify({'error': 'Database not available'}, 500)
     
     try:
+        if STATS_BYTES is not None:
+            return app.response_class(STATS_BYTES, mimetype='application/json')
+        
         # Simple stats without complex calculations
-        stats = {
-            'total_boats': len(boat_db.boats_df),
-            'unique_brands': len(boat_db.boats_df['title'].str.split().str[0].unique()),
-            'year_range': {
-                'min': 'N/A',
-                'max': 'N/A'
-            },
-            'price_range': {
-                'min': 'N/A',
-                'max': 'N/A'
-            }
-        }
-        return jsonify({
+        stats = build_stats()
+        return fast_jsonify({
             'success': True,
             'stats': stats
         })
     except Exception as e:
         # Return basic stats even if there's an error
-        return jsonify({
+        return fast_jsonify({
             'success': True,
             'stats': {
                 'total_boats': len(boat_db.boats_df) if boat_db else 0,
@@ -442,104 +887,98 @@ def get_stats():
 @app.route('/api/analyze', methods=['POST'])
 def analyze_image():
     """Analyze image without uploading to server"""
-    print("🔍 [ANALYZE] Starting image analysis request...")
+    logger.debug("[ANALYZE] Starting image analysis request")
     
     if 'file' not in request.files:
-        print("❌ [ANALYZE] No file in request")
-        return jsonify({'error': 'No file uploaded'}), 400
+        logger.info("[ANALYZE] No file in request")
+        return fast_jsonify({'error': 'No file uploaded'}, 400)
     
     file = request.files['file']
-    print(f"📁 [ANALYZE] File received: {file.filename}")
+    logger.debug("[ANALYZE] File received: %s", file.filename)
     
     if file.filename == '':
-        print("❌ [ANALYZE] No file selected")
-        return jsonify({'error': 'No file selected'}), 400
+        logger.info("[ANALYZE] No file selected")
+        return fast_jsonify({'error': 'No file selected'}, 400)
     
     if file and allowed_file(file.filename):
         try:
-            print("✅ [ANALYZE] File validation passed")
+            logger.debug("[ANALYZE] File validation passed")
             
-            # Read file into memory
-            file_bytes = file.read()
-            print(f"📊 [ANALYZE] File size: {len(file_bytes)} bytes")
+            # Read Werkzeug's (already spooled) upload stream once; validation and
+            # preprocessing all work from this one buffer
+            image_data = image_preprocessor.load_image_buffer(file.stream)
+            logger.debug("[ANALYZE] File size: %d bytes", image_data.size)
             
             # PRODUCTION-LEVEL VALIDATION: Validate image quality and boat detection BEFORE processing
-            print("🔍 [VALIDATION] Starting comprehensive image validation...")
-            validation_result = image_preprocessor.validate_boat_image(file_bytes)
+            logger.debug("[VALIDATION] Starting comprehensive image validation")
+            validation_result = image_preprocessor.validate_boat_image(image_data)
+            quality_validation = validation_result.get('quality_validation', {})
+            boat_detection = validation_result.get('boat_detection', {})
+            quality_score = quality_validation.get('quality_score', 0)
             
             if not validation_result['can_proceed']:
                 rejection_reason = validation_result.get('rejection_reason', 'Image validation failed')
-                print(f"❌ [VALIDATION] Image rejected: {rejection_reason}")
+                logger.info("[VALIDATION] Image rejected: %s", rejection_reason)
                 
                 # Provide helpful error message
                 error_message = f"Image not suitable for analysis. {rejection_reason}"
-                if validation_result.get('quality_validation', {}).get('recommendations'):
-                    error_message += " " + " ".join(validation_result['quality_validation']['recommendations'])
+                recommendations = quality_validation.get('recommendations')
+                if recommendations:
+                    error_message += " " + " ".join(recommendations)
                 else:
                     error_message += " Please upload a clear, well-lit boat image from a good angle where the boat is clearly visible."
                 
-                return jsonify({
+                return fast_jsonify({
                     'success': False,
                     'error': error_message,
                     'validation': {
-                        'quality_score': validation_result.get('quality_validation', {}).get('quality_score', 0),
-                        'boat_detected': validation_result.get('boat_detection', {}).get('boat_detected', False),
+                        'quality_score': quality_score,
+                        'boat_detected': boat_detection.get('boat_detected', False),
                         'combined_confidence': validation_result.get('combined_confidence', 0),
-                        'issues': validation_result.get('quality_validation', {}).get('issues', []) + 
-                                 validation_result.get('boat_detection', {}).get('issues', [])
+                        'issues': quality_validation.get('issues', []) + boat_detection.get('issues', [])
                     },
                     'rejection_reason': rejection_reason
-                }), 400
+                }, 400)
             
-            print(f"✅ [VALIDATION] Image validation passed (Quality: {validation_result.get('quality_validation', {}).get('quality_score', 0):.2f}, Boat Detection: {validation_result.get('boat_detection', {}).get('confidence', 0):.2f})")
+            logger.debug("[VALIDATION] Image validation passed (Quality: %.2f, Boat Detection: %.2f)",
+                         quality_score, boat_detection.get('confidence', 0))
             
             # Preprocess image for better recognition
-            print("🖼️ [PREPROCESS] Starting image preprocessing...")
-            processed_bytes, preprocessing_info = image_preprocessor.preprocess_image(file_bytes, enhance_quality=True)
-            print(f"✅ [PREPROCESS] Preprocessing completed in {preprocessing_info.get('processing_time_ms', 0)}ms")
-            print(f"   Enhancements: {', '.join(preprocessing_info.get('enhancements_applied', []))}")
+            logger.debug("[PREPROCESS] Starting image preprocessing")
+            processed_bytes, preprocessing_info = image_preprocessor.preprocess_image(image_data, enhance_quality=True)
+            logger.debug("[PREPROCESS] Preprocessing completed in %sms, enhancements: %s",
+                         preprocessing_info.get('processing_time_ms', 0),
+                         preprocessing_info.get('enhancements_applied', []))
             
             # Analyze the image
             analysis_result = None
-            location_result = None
-            
-            # Save file temporarily for analysis (use processed image)
-            temp_filename = secure_filename(file.filename)
-            temp_path = os.path.join(app.config['UPLOAD_FOLDER'], temp_filename)
-            with open(temp_path, 'wb') as temp_file:
-                temp_file.write(processed_bytes)
             
             if ai_analyzer:
-                print("🤖 [ANALYZE] Starting AI analysis...")
+                logger.debug("[ANALYZE] Starting AI analysis")
                 # Use preprocessed image for better results
-                analysis_result = ai_analyzer.analyze_boat_image_from_bytes(processed_bytes)
-                print(f"✅ [ANALYZE] AI analysis completed: {analysis_result.get('boat_type', 'Unknown')}")
+                analysis_result = analyze_bytes_cached(processed_bytes)
+                logger.debug("[ANALYZE] AI analysis completed: %s", analysis_result.get('boat_type', 'Unknown'))
                 
                 # Check if analysis failed
                 if 'error' in analysis_result:
-                    print(f"❌ [ANALYZE] AI analysis failed: {analysis_result['error']}")
-                    return jsonify({
+                    logger.error("[ANALYZE] AI analysis failed: %s", analysis_result['error'])
+                    return fast_jsonify({
                         'success': False,
                         'error': analysis_result['error'],
                         'debug_info': {
                             'analyzer_type': getattr(ai_analyzer, 'analyzer_type', 'unknown'),
                             'model_used': analysis_result.get('model_used', 'unknown')
                         }
-                    }), 500
+                    }, 500)
+                
+                confidence = parse_confidence(analysis_result.get('confidence', 0))
                 
                 # Check AI validation (if AI says image is invalid or confidence too low)
                 if not analysis_result.get('is_valid_image', True) or analysis_result.get('rejection_reason'):
                     rejection_reason = analysis_result.get('rejection_reason', 'AI determined image is not suitable')
-                    print(f"❌ [ANALYZE] AI validation failed: {rejection_reason}")
+                    logger.info("[ANALYZE] AI validation failed: %s", rejection_reason)
                     
-                    confidence = analysis_result.get('confidence', 0)
-                    if isinstance(confidence, str):
-                        try:
-                            confidence = float(confidence)
-                        except:
-                            confidence = 0
-                    
-                    return jsonify({
+                    return fast_jsonify({
                         'success': False,
                         'error': f"Image not suitable for analysis. {rejection_reason}",
                         'ai_validation': {
@@ -549,43 +988,30 @@ def analyze_image():
                             'quality_assessment': analysis_result.get('image_quality_assessment', 'Unknown')
                         },
                         'recommendation': 'Please upload a clear, well-lit boat image from a good angle where the boat is clearly visible and in focus.'
-                    }), 400
+                    }, 400)
                 
                 # Check confidence threshold (additional safety)
-                confidence = analysis_result.get('confidence', 0)
-                if isinstance(confidence, str):
-                    try:
-                        confidence = float(confidence)
-                    except:
-                        confidence = 0
-                
                 if confidence < 30:
-                    print(f"⚠️ [ANALYZE] Low confidence ({confidence}%) - image may be unclear")
-                    return jsonify({
+                    logger.info("[ANALYZE] Low confidence (%s%%) - image may be unclear", confidence)
+                    return fast_jsonify({
                         'success': False,
                         'error': f'Analysis confidence too low ({confidence}%). The image may be too blurry, unclear, not a boat, or from a poor angle. Please upload a clear boat image from a good angle.',
                         'confidence': confidence,
                         'recommendation': 'Please upload a clear, well-lit boat image from a good angle where the boat is clearly visible and in focus.'
-                    }), 400
+                    }, 400)
             else:
-                print("❌ [ANALYZE] No AI analyzer available")
-                return jsonify({'error': 'AI analyzer not available'}), 500
-            
-            # Clean up temporary file
-            try:
-                os.remove(temp_path)
-            except:
-                pass
+                logger.error("[ANALYZE] No AI analyzer available")
+                return fast_jsonify({'error': 'AI analyzer not available'}, 500)
             
             # Generate summary
-            print("📝 [ANALYZE] Generating summary...")
+            logger.debug("[ANALYZE] Generating summary")
             summary = ai_analyzer.get_analysis_summary(analysis_result) if ai_analyzer else "Analysis completed"
             
             # Add image name to analysis result
             analysis_result['image_name'] = file.filename
             
             # Save to analysis history
-            print("💾 [ANALYZE] Saving to analysis history...")
+            logger.debug("[ANALYZE] Saving to analysis history")
             history_entry = add_analysis_to_history(analysis_result)
             
             # MVP Response - Focus only on core analysis
@@ -603,33 +1029,46 @@ def analyze_image():
                 }
             }
             
-            print("🎉 [ANALYZE] MVP Analysis completed successfully!")
-            
-            print(f"📊 [ANALYZE] Response data size: {len(str(response_data))} characters")
-            return jsonify(response_data)
+            logger.info("[ANALYZE] Analysis completed: %s", analysis_result.get('boat_type', 'Unknown'))
+            return fast_jsonify(response_data)
                 
         except Exception as e:
-            return jsonify({'error': f'Error processing image: {str(e)}'}), 500
+            return fast_jsonify({'error': f'Error processing image: {str(e)}'}, 500)
     
-    return jsonify({'error': 'Invalid file type'}), 400
+    return fast_jsonify({'error': 'Invalid file type'}, 400)
+
+HEALTH_STAT_TTL = 5  # Seconds a /health file probe is reused
+
+@functools.lru_cache(maxsize=16)
+def cached_stat(path, time_bucket):
+    """os.stat() result for path, or None if it is missing (time_bucket expires entries)"""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+def stat_path(path):
+    """Stat a path at most once per HEALTH_STAT_TTL seconds"""
+    return cached_stat(path, int(time.monotonic() // HEALTH_STAT_TTL))
 
 @app.route('/health')
 def health_check():
     """Health check endpoint with detailed diagnostics"""
+    csv_stat = stat_path('all_boats_data.csv')
     status = {
         'database': boat_db is not None,
         'ai_analyzer': ai_analyzer is not None,
-        'upload_folder': os.path.exists(app.config['UPLOAD_FOLDER'])
+        'upload_folder': stat_path(app.config['UPLOAD_FOLDER']) is not None
     }
     
     # Detailed diagnostics
     diagnostics = {
         'current_directory': os.getcwd(),
-        'csv_file_exists': os.path.exists('all_boats_data.csv'),
-        'csv_file_size': os.path.getsize('all_boats_data.csv') if os.path.exists('all_boats_data.csv') else 0,
+        'csv_file_exists': csv_stat is not None,
+        'csv_file_size': csv_stat.st_size if csv_stat else 0,
         'database_boats_count': len(boat_db.boats_df) if boat_db and boat_db.boats_df is not None else 0,
         'gcp_credentials_env_set': bool(os.getenv('GCP_CREDENTIALS_JSON')),
-        'gcp_credentials_file_exists': os.path.exists('static-chiller-472906-f3-4ee4a099f2f1.json'),
+        'gcp_credentials_file_exists': stat_path('static-chiller-472906-f3-4ee4a099f2f1.json') is not None,
     }
     
     # Get AI model info if available
@@ -640,7 +1079,7 @@ def health_check():
         except:
             pass
     
-    return jsonify({
+    return fast_jsonify({
         'status': 'healthy' if all([status['database'], status['ai_analyzer']]) else 'degraded',
         'components': status,
         'diagnostics': diagnostics,
@@ -651,25 +1090,23 @@ def health_check():
 def get_boats_for_map():
     """Get boats with location data for map visualization"""
     if boat_db is None:
-        return jsonify({'error': 'Database not available'}), 500
+        return fast_jsonify({'error': 'Database not available'}, 500)
     
     try:
         limit = request.args.get('limit', 1000, type=int)
-        boats = boat_db.get_boats_for_map(limit)
+        if limit in MAP_BOATS_PAYLOADS:
+            return cached_json_response(MAP_BOATS_PAYLOADS[limit])
         
-        return jsonify({
-            'success': True,
-            'boats': clean_boat_data_for_json(boats),
-            'count': len(boats)
-        })
+        boats = boat_db.get_boats_for_map(limit)
+        return fast_jsonify(map_boats_payload(boats))
     except Exception as e:
-        return jsonify({'error': f'Error getting boats for map: {str(e)}'}), 500
+        return fast_jsonify({'error': f'Error getting boats for map: {str(e)}'}, 500)
 
 @app.route('/api/map/search')
 def search_boats_by_location():
     """Search boats by location coordinates"""
     if boat_db is None:
-        return jsonify({'error': 'Database not available'}), 500
+        return fast_jsonify({'error': 'Database not available'}, 500)
     
     try:
         lat = request.args.get('lat', type=float)
@@ -678,25 +1115,25 @@ def search_boats_by_location():
         limit = request.args.get('limit', 20, type=int)
         
         if lat is None or lon is None:
-            return jsonify({'error': 'Latitude and longitude are required'}), 400
+            return fast_jsonify({'error': 'Latitude and longitude are required'}, 400)
         
         boats = boat_db.search_by_location(lat, lon, radius, limit)
         
-        return jsonify({
+        return fast_jsonify({
             'success': True,
-            'boats': clean_boat_data_for_json(boats),
+            'boats': boats,
             'count': len(boats),
             'search_center': {'lat': lat, 'lon': lon},
             'radius_km': radius
         })
     except Exception as e:
-        return jsonify({'error': f'Error searching boats by location: {str(e)}'}), 500
+        return fast_jsonify({'error': f'Error searching boats by location: {str(e)}'}, 500)
 
 @app.route('/api/map/location/<location_name>')
 def search_boats_by_location_name(location_name):
     """Search boats by location name"""
     if boat_db is None:
-        return jsonify({'error': 'Database not available'}), 500
+        return fast_jsonify({'error': 'Database not available'}, 500)
     
     try:
         radius = request.args.get('radius', 50, type=float)  # km
@@ -704,193 +1141,210 @@ def search_boats_by_location_name(location_name):
         
         boats = boat_db.search_by_location_name(location_name, radius, limit)
         
-        return jsonify({
+        return fast_jsonify({
             'success': True,
-            'boats': clean_boat_data_for_json(boats),
+            'boats': boats,
             'count': len(boats),
             'location': location_name,
             'radius_km': radius
         })
     except Exception as e:
-        return jsonify({'error': f'Error searching boats by location name: {str(e)}'}), 500
+        return fast_jsonify({'error': f'Error searching boats by location name: {str(e)}'}, 500)
 
 @app.route('/api/map/analyze-location', methods=['POST'])
 def analyze_image_location():
     """Analyze boat image to detect location"""
-    print("🗺️ [LOCATION] Starting location analysis request...")
+    logger.debug("[LOCATION] Starting location analysis request")
     
     if location_analyzer is None:
-        print("❌ [LOCATION] Location analyzer not available")
-        return jsonify({'error': 'Location analyzer not available'}), 500
+        logger.error("[LOCATION] Location analyzer not available")
+        return fast_jsonify({'error': 'Location analyzer not available'}, 500)
     
     if 'file' not in request.files:
-        print("❌ [LOCATION] No file in request")
-        return jsonify({'error': 'No file provided'}), 400
+        logger.info("[LOCATION] No file in request")
+        return fast_jsonify({'error': 'No file provided'}, 400)
     
     file = request.files['file']
-    print(f"📁 [LOCATION] File received: {file.filename}")
+    logger.debug("[LOCATION] File received: %s", file.filename)
     
     if file.filename == '':
-        print("❌ [LOCATION] No file selected")
-        return jsonify({'error': 'No file selected'}), 400
+        logger.info("[LOCATION] No file selected")
+        return fast_jsonify({'error': 'No file selected'}, 400)
     
     if file and allowed_file(file.filename):
         try:
-            print("✅ [LOCATION] File validation passed")
-            file_bytes = file.read()
-            print(f"📊 [LOCATION] File size: {len(file_bytes)} bytes")
-            
-            print("🤖 [LOCATION] Starting location analysis...")
-            location_result = location_analyzer.analyze_image_location(file_bytes)
-            print(f"✅ [LOCATION] Location analysis result: {location_result}")
+            logger.debug("[LOCATION] File validation passed")
+            # Werkzeug already spools the upload (MAX_CONTENT_LENGTH rejects oversized
+            # requests), so hand its stream over without copying it
+            logger.debug("[LOCATION] Starting location analysis")
+            location_result = location_analyzer.analyze_image_location(file.stream)
+            logger.debug("[LOCATION] Location analysis result: %s", location_result)
             
             if location_result.get('success'):
-                print("🔍 [LOCATION] Searching for nearby boats...")
-                # Get nearby boats for each detected location
-                nearby_boats = []
-                for location in location_result.get('detected_locations', []):
-                    print(f"🔍 [LOCATION] Searching near {location['name']} ({location['lat']}, {location['lon']})")
-                    boats = boat_db.search_by_location(
+                logger.debug("[LOCATION] Searching for nearby boats")
+                # Get nearby boats for each detected location (searches run concurrently,
+                # results are collected in location order)
+                detected_locations = location_result.get('detected_locations', [])
+                pool = get_search_pool()
+                futures = []
+                for location in detected_locations:
+                    logger.debug("[LOCATION] Searching near %s (%s, %s)", location['name'], location['lat'], location['lon'])
+                    futures.append(pool.submit(
+                        boat_db.search_by_location,
                         location['lat'], 
                         location['lon'], 
                         radius_km=50, 
                         limit=10
-                    )
-                    print(f"✅ [LOCATION] Found {len(boats)} boats near {location['name']}")
+                    ))
+                
+                nearby_boats = []
+                for location, future in zip(detected_locations, futures):
+                    boats = future.result()
+                    logger.debug("[LOCATION] Found %d boats near %s", len(boats), location['name'])
                     nearby_boats.extend(boats)
                 
-                print(f"🎉 [LOCATION] Total nearby boats found: {len(nearby_boats)}")
+                logger.debug("[LOCATION] Total nearby boats found: %d", len(nearby_boats))
                 
-                return jsonify({
+                return fast_jsonify({
                     'success': True,
                     'detected_locations': location_result.get('detected_locations'),
-                    'nearby_boats': clean_boat_data_for_json(nearby_boats),
+                    'nearby_boats': nearby_boats,
                     'confidence': location_result.get('confidence'),
                     'analysis_method': location_result.get('analysis_method')
                 })
             else:
-                print(f"❌ [LOCATION] Location analysis failed: {location_result.get('error')}")
-                return jsonify({
+                logger.error("[LOCATION] Location analysis failed: %s", location_result.get('error'))
+                return fast_jsonify({
                     'success': False,
                     'error': location_result.get('error')
-                }), 500
+                }, 500)
                 
         except Exception as e:
-            print(f"❌ [LOCATION] Exception during analysis: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return jsonify({'error': f'Error analyzing image location: {str(e)}'}), 500
+            logger.exception("[LOCATION] Exception during analysis: %s", e)
+            return fast_jsonify({'error': f'Error analyzing image location: {str(e)}'}, 500)
     
-    print("❌ [LOCATION] Invalid file type")
-    return jsonify({'error': 'Invalid file type'}), 400
+    logger.info("[LOCATION] Invalid file type")
+    return fast_jsonify({'error': 'Invalid file type'}, 400)
 
 @app.route('/api/map/stats')
 def get_location_stats():
     """Get location statistics"""
     if boat_db is None:
-        return jsonify({'error': 'Database not available'}), 500
+        return fast_jsonify({'error': 'Database not available'}, 500)
     
     try:
         stats = boat_db.get_location_statistics()
-        return jsonify({
+        return fast_jsonify({
             'success': True,
             'location_stats': stats
         })
     except Exception as e:
-        return jsonify({'error': f'Error getting location stats: {str(e)}'}), 500
+        return fast_jsonify({'error': f'Error getting location stats: {str(e)}'}, 500)
+
+@functools.lru_cache(maxsize=1)
+def model_info_payload(analyzer_id):
+    """Pre-serialized /api/model-info body (analyzer_id is id(ai_analyzer), fixed after init)"""
+    if hasattr(ai_analyzer, 'get_model_info'):
+        model_info = ai_analyzer.get_model_info()
+    else:
+        model_info = {
+            'model_name': 'gemini-1.5-flash',
+            'provider': 'Google AI Studio',
+            'analyzer_type': 'regular_gemini'
+        }
+    return build_cached_payload({
+        'success': True,
+        'model_info': model_info
+    })
 
 @app.route('/api/model-info')
 def get_model_info():
     """Get AI model information"""
     if not ai_analyzer:
-        return jsonify({'error': 'AI analyzer not available'}), 500
+        return fast_jsonify({'error': 'AI analyzer not available'}, 500)
     
     try:
-        if hasattr(ai_analyzer, 'get_model_info'):
-            model_info = ai_analyzer.get_model_info()
-            return jsonify({
-                'success': True,
-                'model_info': model_info
-            })
-        else:
-            return jsonify({
-                'success': True,
-                'model_info': {
-                    'model_name': 'gemini-1.5-flash',
-                    'provider': 'Google AI Studio',
-                    'analyzer_type': 'regular_gemini'
-                }
-            })
+        return cached_json_response(model_info_payload(id(ai_analyzer)))
     except Exception as e:
-        return jsonify({'error': f'Error getting model info: {str(e)}'}), 500
+        return fast_jsonify({'error': f'Error getting model info: {str(e)}'}, 500)
 
 @app.route('/api/history')
 def get_analysis_history():
     """Get analysis history"""
     try:
-        history = load_analysis_history()
-        return jsonify({
+        history = current_history()
+        return fast_jsonify({
             'success': True,
             'history': history,
             'total': len(history)
         })
     except Exception as e:
-        return jsonify({'error': f'Error loading history: {str(e)}'}), 500
+        return fast_jsonify({'error': f'Error loading history: {str(e)}'}, 500)
 
 @app.route('/api/history/<history_id>')
 def get_analysis_by_id(history_id):
     """Get specific analysis by ID"""
     try:
-        history = load_analysis_history()
-        analysis = next((item for item in history if item['id'] == history_id), None)
+        analysis = find_history_entry(history_id)
         
         if analysis:
-            return jsonify({
+            return fast_jsonify({
                 'success': True,
                 'analysis': analysis
             })
         else:
-            return jsonify({'error': 'Analysis not found'}), 404
+            return fast_jsonify({'error': 'Analysis not found'}, 404)
     except Exception as e:
-        return jsonify({'error': f'Error loading analysis: {str(e)}'}), 500
+        return fast_jsonify({'error': f'Error loading analysis: {str(e)}'}, 500)
 
 @app.route('/api/history/<history_id>', methods=['DELETE'])
 def delete_analysis(history_id):
     """Delete analysis from history"""
+    global history_writes
+    
     try:
-        history = load_analysis_history()
-        history = [item for item in history if item['id'] != history_id]
-        save_analysis_history(history)
-        
-        return jsonify({
+        # The entry may have been written by another worker, so look in the file too
+        if find_history_entry(history_id) is None:
+            return fast_jsonify({'error': 'Analysis not found'}, 404)
+        
+        with history_lock:
+            HISTORY_PENDING.pop(history_id, None)
+            HISTORY_PENDING_DELETES.add(history_id)
+            # Append a delete marker instead of rewriting the file; compaction drops both
+            HISTORY_QUEUE.put({'deleted_id': history_id})
+            history_writes += 1
+            if history_writes >= HISTORY_COMPACT_EVERY:
+                compact_analysis_history()
+        
+        return fast_jsonify({
             'success': True,
             'message': 'Analysis deleted successfully'
         })
     except Exception as e:
-        return jsonify({'error': f'Error deleting analysis: {str(e)}'}), 500
+        return fast_jsonify({'error': f'Error deleting analysis: {str(e)}'}, 500)
 
 @app.route('/api/analyze-text', methods=['POST'])
 def analyze_boat_text():
     """Analyze boat from text search without photo"""
-    print("🔍 [TEXT-ANALYZE] Starting text-based boat analysis...")
+    logger.debug("[TEXT-ANALYZE] Starting text-based boat analysis")
     
     if not ai_analyzer:
-        print("❌ [TEXT-ANALYZE] No AI analyzer available")
-        return jsonify({'error': 'AI analyzer not available'}), 500
+        logger.error("[TEXT-ANALYZE] No AI analyzer available")
+        return fast_jsonify({'error': 'AI analyzer not available'}, 500)
     
     if not boat_db:
-        print("❌ [TEXT-ANALYZE] No database available")
-        return jsonify({'error': 'Database not available'}), 500
+        logger.error("[TEXT-ANALYZE] No database available")
+        return fast_jsonify({'error': 'Database not available'}, 500)
     
     try:
         data = request.get_json()
         boat_id = data.get('boat_id')
         search_mode = data.get('search_mode', False)
         
-        print(f"🔍 [TEXT-ANALYZE] Boat ID: {boat_id}, Search mode: {search_mode}")
+        logger.debug("[TEXT-ANALYZE] Boat ID: %s, Search mode: %s", boat_id, search_mode)
         
         if not boat_id:
-            return jsonify({'error': 'Boat ID is required'}), 400
+            return fast_jsonify({'error': 'Boat ID is required'}, 400)
         
         # Find the boat in database
         boat_data = None
@@ -906,10 +1360,10 @@ def analyze_boat_text():
             boat_data = boat_db.get_boat_by_id(boat_id)
         
         if not boat_data:
-            print(f"❌ [TEXT-ANALYZE] Boat not found: {boat_id}")
-            return jsonify({'error': 'Boat not found in database'}), 404
+            logger.info("[TEXT-ANALYZE] Boat not found: %s", boat_id)
+            return fast_jsonify({'error': 'Boat not found in database'}, 404)
         
-        print(f"✅ [TEXT-ANALYZE] Found boat: {boat_data.get('title', 'Unknown')}")
+        logger.debug("[TEXT-ANALYZE] Found boat: %s", boat_data.get('title', 'Unknown'))
         
         # Clean boat data for JSON serialization
         boat_data = clean_single_boat_data(boat_data)
@@ -917,8 +1371,9 @@ def analyze_boat_text():
         # Create analysis result from boat data
         analysis_result = create_analysis_from_boat_data(boat_data)
         
-        # Generate summary
-        print("📝 [TEXT-ANALYZE] Generating summary...")
+        # Generate summary (local string formatting, no model call, so it runs
+        # inline; requests waiting on I/O are spread over the gthread workers)
+        logger.debug("[TEXT-ANALYZE] Generating summary")
         summary = ai_analyzer.get_analysis_summary(analysis_result) if ai_analyzer else "Analysis completed"
         
         # Add metadata
@@ -927,7 +1382,7 @@ def analyze_boat_text():
         analysis_result['boat_id'] = boat_id
         
         # Save to analysis history
-        print("💾 [TEXT-ANALYZE] Saving to analysis history...")
+        logger.debug("[TEXT-ANALYZE] Saving to analysis history")
         history_entry = add_analysis_to_history(analysis_result)
         
         # Response
@@ -940,40 +1395,67 @@ def analyze_boat_text():
             'boat_data': boat_data
         }
         
-        print("🎉 [TEXT-ANALYZE] Text analysis completed successfully!")
-        return jsonify(response_data)
+        logger.debug("[TEXT-ANALYZE] Text analysis completed")
+        return fast_jsonify(response_data)
         
     except Exception as e:
-        print(f"❌ [TEXT-ANALYZE] Error: {str(e)}")
-        return jsonify({'error': f'Error analyzing boat: {str(e)}'}), 500
+        logger.error("[TEXT-ANALYZE] Error: %s", e)
+        return fast_jsonify({'error': f'Error analyzing boat: {str(e)}'}, 500)
+
+# (analysis key, boat_data key) pairs copied as-is, 'Unknown' when missing
+ANALYSIS_FIELDS = (
+    ('boat_type', 'boat_type'),
+    ('brand', 'brand'),
+    ('model', 'model'),
+    ('model_line', 'model_line'),
+    ('estimated_year', 'year_built'),
+    ('length_estimate', 'length'),
+    ('width_estimate', 'width'),
+    ('hull_material', 'hull_material'),
+    ('engine_type', 'engine_type'),
+    ('hull_type', 'hull_type'),
+)
+
+# Nested analysis sections: section -> ((boat_data key, fallback text), ...)
+ANALYSIS_SECTIONS = {
+    'design_analysis': (
+        ('hull_design', 'Design information not available'),
+        ('cabin_layout', 'Cabin layout information not available'),
+        ('deck_features', 'Deck features information not available'),
+        ('aerodynamics', 'Aerodynamics information not available'),
+    ),
+    'market_positioning': (
+        ('target_market', 'Market information not available'),
+        ('competitors', 'Competitor information not available'),
+        ('unique_selling_points', 'USP information not available'),
+        ('ideal_use_cases', 'Use case information not available'),
+    ),
+    'historical_context': (
+        ('design_era', 'Era information not available'),
+        ('manufacturer_history', 'Manufacturer history not available'),
+        ('model_evolution', 'Model evolution not available'),
+        ('market_reception', 'Market reception not available'),
+    ),
+}
 
 def create_analysis_from_boat_data(boat_data):
     """Create analysis result from boat database data"""
-    analysis = {
-        'boat_type': boat_data.get('boat_type', 'Unknown'),
-        'brand': boat_data.get('brand', 'Unknown'),
-        'model': boat_data.get('model', 'Unknown'),
-        'model_line': boat_data.get('model_line', 'Unknown'),
-        'estimated_year': boat_data.get('year_built', 'Unknown'),
-        'length_estimate': boat_data.get('length', 'Unknown'),
-        'width_estimate': boat_data.get('width', 'Unknown'),
-        'hull_material': boat_data.get('hull_material', 'Unknown'),
-        'engine_type': boat_data.get('engine_type', 'Unknown'),
-        'hull_type': boat_data.get('hull_type', 'Unknown'),
+    get = boat_data.get
+    analysis = {key: get(source, 'Unknown') for key, source in ANALYSIS_FIELDS}
+    analysis.update({
         'key_features': extract_key_features(boat_data),
         'distinctive_elements': extract_distinctive_elements(boat_data),
         'condition': 'Database Entry',
-        'price_estimate': boat_data.get('price', 'Unknown'),
+        'price_estimate': get('price', 'Unknown'),
         'confidence': calculate_confidence(boat_data),
         'detailed_description': create_detailed_description(boat_data),
         'identification_clues': create_identification_clues(boat_data),
         'technical_specs': extract_technical_specs(boat_data),
-        'design_analysis': create_design_analysis(boat_data),
-        'market_positioning': create_market_positioning(boat_data),
-        'historical_context': create_historical_context(boat_data),
-        'model_used': 'database-analysis',
-        'analyzer_type': 'text_search'
-    }
+    })
+    for section, fields in ANALYSIS_SECTIONS.items():
+        analysis[section] = {key: get(key, fallback) for key, fallback in fields}
+    analysis['model_used'] = 'database-analysis'
+    analysis['analyzer_type'] = 'text_search'
     
     return analysis
 
@@ -1051,374 +1533,322 @@ def extract_technical_specs(boat_data):
     if boat_data.get('berths'): specs['berths'] = boat_data['berths']
     return specs
 
-def create_design_analysis(boat_data):
-    """Create design analysis from boat data"""
+# Data Insights API Endpoints
+@functools.lru_cache(maxsize=1)
+def build_data_insights_summary(frame_id):
+    """Executive summary statistics (frame_id is id(boat_db.boats_df), so a reload recomputes)"""
+    arrays = boat_db.insights_arrays
+    prices, years, lengths = arrays['price'], arrays['year'], arrays['length']
+    top_brands = boat_db.insights_df['brand'].value_counts().head(10)
+    
+    # One np.percentile call (a single partition) per column instead of a pass per statistic
+    price_stats = {'count': len(prices), 'median': None, 'mean': None, 'min': None, 'max': None, 'q25': None, 'q75': None}
+    if len(prices) > 0:
+        p_min, q25, p_median, q75, p_max = np.percentile(prices, [0, 25, 50, 75, 100]).tolist()
+        price_stats.update(median=p_median, mean=float(prices.mean(dtype=np.float64)),
+                           min=p_min, max=p_max, q25=q25, q75=q75)
+    
+    year_stats = {'count': len(years), 'min': None, 'max': None, 'median': None, 'mean': None}
+    if len(years) > 0:
+        y_min, y_median, y_max = np.percentile(years, [0, 50, 100]).tolist()
+        year_stats.update(min=int(y_min), max=int(y_max), median=int(y_median),
+                          mean=float(years.mean(dtype=np.float64)))
+    
+    length_stats = {'count': len(lengths), 'min': None, 'max': None, 'median': None, 'mean': None}
+    if len(lengths) > 0:
+        l_min, l_median, l_max = np.percentile(lengths, [0, 50, 100]).tolist()
+        length_stats.update(min=l_min, max=l_max, median=l_median, mean=float(lengths.mean()))
+    
     return {
-        'hull_design': boat_data.get('hull_design', 'Design information not available'),
-        'cabin_layout': boat_data.get('cabin_layout', 'Cabin layout information not available'),
-        'deck_features': boat_data.get('deck_features', 'Deck features information not available'),
-        'aerodynamics': boat_data.get('aerodynamics', 'Aerodynamics information not available')
+        'total_boats': len(boat_db.boats_df),
+        'price_stats': price_stats,
+        'year_stats': year_stats,
+        'length_stats': length_stats,
+        'top_brands': dict(zip(top_brands.index.astype(str), top_brands.tolist()))
     }
 
-def create_market_positioning(boat_data):
-    """Create market positioning from boat data"""
+PRICE_BIN_EDGES = np.array([0, 10000, 25000, 50000, 100000, 200000, 500000, 1000000], dtype=np.float64)
+PRICE_BIN_LABELS = ['<10K', '10K-25K', '25K-50K', '50K-100K', '100K-200K', '200K-500K', '500K-1M', '>1M']
+SIZE_BIN_EDGES = np.array([0, 5, 8, 10, 12, 15, 20, 30], dtype=np.float64)
+SIZE_BIN_LABELS = ['<5m', '5-8m', '8-10m', '10-12m', '12-15m', '15-20m', '20-30m', '>30m']
+
+def bin_counts(values, edges, labels):
+    """Count values per right-closed bin, the last bin open-ended (same bins as pd.cut with include_lowest)"""
+    values = values[values >= edges[0]]
+    counts = np.bincount(np.digitize(values, edges[1:], right=True), minlength=len(labels))
+    return dict(zip(labels, counts))
+
+def int_value_counts(values):
+    """Sorted distinct integers and their counts (bincount over the value span, no sort)"""
+    low = int(values.min())
+    if int(values.max()) - low > 100000:
+        return np.unique(values, return_counts=True)
+    counts = np.bincount(values - low)
+    present = np.flatnonzero(counts)
+    return present + low, counts[present]
+
+# Insight builders return the JSON body of one /api/data-insights/* section
+def build_summary_insight():
+    """Executive summary section"""
+    return {'success': True, 'summary': build_data_insights_summary(id(boat_db.boats_df))}
+
+def build_price_insight():
+    """Price histogram section"""
+    prices = boat_db.insights_arrays['price']
+    
+    if len(prices) > 0:
+        return {
+            'success': True,
+            'distribution': bin_counts(prices, PRICE_BIN_EDGES, PRICE_BIN_LABELS),
+            'raw_data': prices[:1000].astype(np.float64)
+        }
+    return {'success': True, 'distribution': {}, 'raw_data': []}
+
+def build_year_insight():
+    """Year distribution section"""
+    years = boat_db.insights_arrays['year']
+    
+    if len(years) > 0:
+        whole_years = years.astype(np.int64)  # truncates like int() did
+        decades, decade_counts = int_value_counts(whole_years // 10 * 10)
+        recent, recent_counts = int_value_counts(whole_years[years >= int(years.max()) - 20])
+        year_counts = boat_db.insights_df['year'].value_counts().head(50)
+        
+        return {
+            'success': True,
+            'by_decade': dict(zip(map(str, decades.tolist()), decade_counts)),
+            'recent_years': dict(zip(map(str, recent.tolist()), recent_counts)),
+            'all_years': dict(zip(year_counts.index.astype(np.int64).astype(str), year_counts.tolist()))
+        }
+    return {'success': True, 'by_decade': {}, 'recent_years': {}, 'all_years': {}}
+
+def build_brand_insight():
+    """Brand counts and per-brand price section"""
+    insights = boat_db.insights_df
+    brand_counts = insights['brand'].value_counts().head(20)
+    top_brands = brand_counts.index[:10]
+    
+    # One grouped pass over the top brands; brands without any price are left out
+    price_stats = (
+        insights[insights['brand'].isin(top_brands)]
+        .groupby('brand', sort=False, observed=True)['price']
+        .agg(['size', 'mean', 'median'])
+        .reindex(top_brands)
+        .dropna(subset=['mean'])
+    )
+    brand_price_stats = {
+        str(brand): {
+            'count': int(row['size']),
+            'avg_price': float(row['mean']),
+            'median_price': float(row['median'])
+        }
+        for brand, row in price_stats.iterrows()
+    }
+    
     return {
-        'target_market': boat_data.get('target_market', 'Market information not available'),
-        'competitors': boat_data.get('competitors', 'Competitor information not available'),
-        'unique_selling_points': boat_data.get('unique_selling_points', 'USP information not available'),
-        'ideal_use_cases': boat_data.get('ideal_use_cases', 'Use case information not available')
+        'success': True,
+        'brand_counts': dict(zip(brand_counts.index.astype(str), brand_counts.tolist())),
+        'brand_price_stats': brand_price_stats
     }
 
-def create_historical_context(boat_data):
-    """Create historical context from boat data"""
+def build_length_insight():
+    """Boat size (length) distribution section"""
+    lengths = boat_db.insights_arrays['length']
+    
+    if len(lengths) > 0:
+        l_min, l_median, l_max = np.percentile(lengths, [0, 50, 100]).tolist()
+        return {
+            'success': True,
+            'distribution': bin_counts(lengths, SIZE_BIN_EDGES, SIZE_BIN_LABELS),
+            'stats': {'min': l_min, 'max': l_max, 'median': l_median, 'mean': float(lengths.mean())}
+        }
+    return {'success': True, 'distribution': {}, 'stats': {}}
+
+def build_trends_insight():
+    """Yearly market trends section"""
+    # Only the numeric columns; the brand strings aren't needed for the yearly aggregates
+    valid_data = boat_db.insights_df[['year', 'price', 'length']].dropna(subset=['year', 'price'])
+    
+    if len(valid_data) > 0:
+        # Whole-number years group on int16 keys (cheaper to hash and sort than floats)
+        year_keys = pd.Series(narrow_array(valid_data['year'], np.int16), index=valid_data.index, name='year')
+        yearly_stats = valid_data.groupby(year_keys).agg({
+            'price': ['count', 'mean', 'median'],
+            'length': 'mean'
+        }).reset_index()
+        
+        yearly_stats.columns = ['year', 'count', 'avg_price', 'median_price', 'avg_length']
+        
+        # Contiguous numpy columns go straight to orjson (NaN lengths become null)
+        trends = {
+            'years': yearly_stats['year'].to_numpy(dtype=np.int64),
+            'counts': yearly_stats['count'].to_numpy(dtype=np.int64),
+            'avg_prices': yearly_stats['avg_price'].to_numpy(dtype=np.float64),
+            'median_prices': yearly_stats['median_price'].to_numpy(dtype=np.float64),
+            'avg_lengths': yearly_stats['avg_length'].to_numpy(dtype=np.float64)
+        }
+        
+        return {'success': True, 'trends': trends}
     return {
-        'design_era': boat_data.get('design_era', 'Era information not available'),
-        'manufacturer_history': boat_data.get('manufacturer_history', 'Manufacturer history not available'),
-        'model_evolution': boat_data.get('model_evolution', 'Model evolution not available'),
-        'market_reception': boat_data.get('market_reception', 'Market reception not available')
+        'success': True,
+        'trends': {
+            'years': [], 'counts': [], 'avg_prices': [],
+            'median_prices': [], 'avg_lengths': []
+        }
     }
 
-# Data Insights API Endpoints
+# Bundle field -> (builder, error prefix used by the section's own endpoint)
+INSIGHT_BUILDERS = {
+    'summary': (build_summary_insight, 'Error generating summary'),
+    'price': (build_price_insight, 'Error generating price distribution'),
+    'year': (build_year_insight, 'Error generating year distribution'),
+    'brand': (build_brand_insight, 'Error generating brand stats'),
+    'length': (build_length_insight, 'Error generating size distribution'),
+    'trends': (build_trends_insight, 'Error generating market trends'),
+}
+
+# boats_df never changes in place, so sections are built once per frame (frame_id is
+# id(boat_db.boats_df)); failures raise and are not cached
+@functools.lru_cache(maxsize=len(INSIGHT_BUILDERS))
+def insight_section(name, frame_id):
+    """Body of one insights section"""
+    return INSIGHT_BUILDERS[name][0]()
+
+@functools.lru_cache(maxsize=32)
+def insight_payload(names, frame_id):
+    """Pre-serialized payload for one section (a name) or a bundle (a tuple of names)"""
+    if isinstance(names, str):
+        return build_cached_payload(insight_section(names, frame_id))
+    return build_cached_payload({
+        'success': True,
+        'insights': {name: insight_section(name, frame_id) for name in names}
+    })
+
+def insight_response(name):
+    """Serve one insights section the way its standalone endpoint always has"""
+    try:
+        if boat_db is None or boat_db.boats_df is None or len(boat_db.boats_df) == 0:
+            return fast_jsonify({'error': 'Database not available', 'message': 'Boat database not initialized or empty.'}, 500)
+        return cached_json_response(insight_payload(name, id(boat_db.boats_df)))
+    except Exception as e:
+        return fast_jsonify({'error': f'{INSIGHT_BUILDERS[name][1]}: {str(e)}'}, 500)
+
 @app.route('/api/data-insights/summary')
 def get_data_insights_summary():
     """Get executive summary statistics"""
-    try:
-        if boat_db is None:
-            return jsonify({
-                'error': 'Database not available',
-                'message': 'Boat database not initialized. Please check server logs.',
-                'diagnostics': {
-                    'csv_exists': os.path.exists('all_boats_data.csv'),
-                    'current_dir': os.getcwd()
-                }
-            }), 500
-        
-        if boat_db.boats_df is None or len(boat_db.boats_df) == 0:
-            return jsonify({
-                'error': 'Database empty',
-                'message': 'Boat database is initialized but contains no data.'
-            }), 500
-        
-        df = boat_db.boats_df
-        total_boats = len(df)
-        
-        def extract_price(price_str):
-            if pd.isna(price_str) or price_str == '' or 'Price on Request' in str(price_str) or 'Under Offer' in str(price_str):
-                return None
-            try:
-                price_clean = str(price_str).replace('EUR', '').replace(',', '').replace('.', '').replace('-', '').replace(' ', '').strip()
-                import re
-                numbers = re.findall(r'\d+', price_clean)
-                if numbers:
-                    return int(''.join(numbers))
-                return None
-            except:
-                return None
-        
-        prices = df['price'].apply(extract_price).dropna()
-        years = pd.to_numeric(df['year_built'], errors='coerce').dropna()
-        
-        def extract_length(dim_str):
-            if pd.isna(dim_str) or dim_str == '' or 'N/A' in str(dim_str):
-                return None
-            try:
-                import re
-                match = re.search(r'(\d+\.?\d*)\s*x', str(dim_str))
-                if match:
-                    return float(match.group(1))
-                return None
-            except:
-                return None
-        
-        lengths = df['dimensions'].apply(extract_length).dropna()
-        
-        def extract_brand(title):
-            if pd.isna(title):
-                return None
-            words = str(title).split()
-            if words:
-                return words[0]
-            return None
-        
-        brands = df['title'].apply(extract_brand).dropna()
-        top_brands = brands.value_counts().head(10).to_dict()
-        
-        summary = {
-            'total_boats': total_boats,
-            'price_stats': {
-                'count': len(prices),
-                'median': float(prices.median()) if len(prices) > 0 else None,
-                'mean': float(prices.mean()) if len(prices) > 0 else None,
-                'min': float(prices.min()) if len(prices) > 0 else None,
-                'max': float(prices.max()) if len(prices) > 0 else None,
-                'q25': float(prices.quantile(0.25)) if len(prices) > 0 else None,
-                'q75': float(prices.quantile(0.75)) if len(prices) > 0 else None
-            },
-            'year_stats': {
-                'count': len(years),
-                'min': int(years.min()) if len(years) > 0 else None,
-                'max': int(years.max()) if len(years) > 0 else None,
-                'median': int(years.median()) if len(years) > 0 else None,
-                'mean': float(years.mean()) if len(years) > 0 else None
-            },
-            'length_stats': {
-                'count': len(lengths),
-                'min': float(lengths.min()) if len(lengths) > 0 else None,
-                'max': float(lengths.max()) if len(lengths) > 0 else None,
-                'median': float(lengths.median()) if len(lengths) > 0 else None,
-                'mean': float(lengths.mean()) if len(lengths) > 0 else None
-            },
-            'top_brands': {str(k): int(v) for k, v in top_brands.items()}
-        }
-        
-        return jsonify({'success': True, 'summary': summary})
-    except Exception as e:
-        return jsonify({'error': f'Error generating summary: {str(e)}'}), 500
+    if boat_db is None:
+        return fast_jsonify({
+            'error': 'Database not available',
+            'message': 'Boat database not initialized. Please check server logs.',
+            'diagnostics': {
+                'csv_exists': os.path.exists('all_boats_data.csv'),
+                'current_dir': os.getcwd()
+            }
+        }, 500)
+    
+    if boat_db.boats_df is None or len(boat_db.boats_df) == 0:
+        return fast_jsonify({
+            'error': 'Database empty',
+            'message': 'Boat database is initialized but contains no data.'
+        }, 500)
+    
+    return insight_response('summary')
 
 @app.route('/api/data-insights/price-distribution')
 def get_price_distribution():
     """Get price distribution data for histogram"""
-    try:
-        if boat_db is None or boat_db.boats_df is None or len(boat_db.boats_df) == 0:
-            return jsonify({
-                'error': 'Database not available',
-                'message': 'Boat database not initialized or empty.'
-            }), 500
-        
-        df = boat_db.boats_df
-        
-        def extract_price(price_str):
-            if pd.isna(price_str) or price_str == '' or 'Price on Request' in str(price_str) or 'Under Offer' in str(price_str):
-                return None
-            try:
-                price_clean = str(price_str).replace('EUR', '').replace(',', '').replace('.', '').replace('-', '').replace(' ', '').strip()
-                import re
-                numbers = re.findall(r'\d+', price_clean)
-                if numbers:
-                    return int(''.join(numbers))
-                return None
-            except:
-                return None
-        
-        prices = df['price'].apply(extract_price).dropna()
-        
-        if len(prices) > 0:
-            max_price = prices.max()
-            bins = [0, 10000, 25000, 50000, 100000, 200000, 500000, 1000000, max_price]
-            labels = ['<10K', '10K-25K', '25K-50K', '50K-100K', '100K-200K', '200K-500K', '500K-1M', '>1M']
-            price_categories = pd.cut(prices, bins=bins, labels=labels, include_lowest=True)
-            distribution = price_categories.value_counts().sort_index().to_dict()
-            
-            return jsonify({
-                'success': True,
-                'distribution': {str(k): int(v) for k, v in distribution.items()},
-                'raw_data': prices.tolist()[:1000]
-            })
-        else:
-            return jsonify({'success': True, 'distribution': {}, 'raw_data': []})
-    except Exception as e:
-        return jsonify({'error': f'Error generating price distribution: {str(e)}'}), 500
+    return insight_response('price')
 
 @app.route('/api/data-insights/year-distribution')
 def get_year_distribution():
     """Get year distribution data"""
-    try:
-        if boat_db is None or boat_db.boats_df is None or len(boat_db.boats_df) == 0:
-            return jsonify({'error': 'Database not available', 'message': 'Boat database not initialized or empty.'}), 500
-        
-        df = boat_db.boats_df
-        years = pd.to_numeric(df['year_built'], errors='coerce').dropna()
-        
-        if len(years) > 0:
-            decades = {}
-            for year in years:
-                decade = (int(year) // 10) * 10
-                decades[decade] = decades.get(decade, 0) + 1
-            
-            max_year = int(years.max())
-            recent_years = {}
-            for year in years:
-                if year >= max_year - 20:
-                    recent_years[int(year)] = recent_years.get(int(year), 0) + 1
-            
-            return jsonify({
-                'success': True,
-                'by_decade': {str(k): int(v) for k, v in sorted(decades.items())},
-                'recent_years': {str(k): int(v) for k, v in sorted(recent_years.items())},
-                'all_years': {str(int(k)): int(v) for k, v in years.value_counts().head(50).items()}
-            })
-        else:
-            return jsonify({'success': True, 'by_decade': {}, 'recent_years': {}, 'all_years': {}})
-    except Exception as e:
-        return jsonify({'error': f'Error generating year distribution: {str(e)}'}), 500
+    return insight_response('year')
 
 @app.route('/api/data-insights/brand-stats')
 def get_brand_stats():
     """Get brand statistics"""
-    try:
-        if boat_db is None or boat_db.boats_df is None or len(boat_db.boats_df) == 0:
-            return jsonify({'error': 'Database not available', 'message': 'Boat database not initialized or empty.'}), 500
-        
-        df = boat_db.boats_df
-        
-        def extract_brand(title):
-            if pd.isna(title):
-                return None
-            words = str(title).split()
-            if words:
-                return words[0]
-            return None
-        
-        def extract_price(price_str):
-            if pd.isna(price_str) or price_str == '' or 'Price on Request' in str(price_str) or 'Under Offer' in str(price_str):
-                return None
-            try:
-                price_clean = str(price_str).replace('EUR', '').replace(',', '').replace('.', '').replace('-', '').replace(' ', '').strip()
-                import re
-                numbers = re.findall(r'\d+', price_clean)
-                if numbers:
-                    return int(''.join(numbers))
-                return None
-            except:
-                return None
-        
-        brands = df['title'].apply(extract_brand).dropna()
-        brand_counts = brands.value_counts().head(20)
-        
-        brand_price_stats = {}
-        for brand in brand_counts.index[:10]:
-            brand_df = df[df['title'].str.startswith(brand, na=False)]
-            prices = brand_df['price'].apply(extract_price)
-            prices = prices.dropna()
-            if len(prices) > 0:
-                brand_price_stats[brand] = {
-                    'count': len(brand_df),
-                    'avg_price': float(prices.mean()),
-                    'median_price': float(prices.median())
-                }
-        
-        return jsonify({
-            'success': True,
-            'brand_counts': {str(k): int(v) for k, v in brand_counts.items()},
-            'brand_price_stats': brand_price_stats
-        })
-    except Exception as e:
-        return jsonify({'error': f'Error generating brand stats: {str(e)}'}), 500
+    return insight_response('brand')
 
 @app.route('/api/data-insights/size-distribution')
 def get_size_distribution():
     """Get boat size (length) distribution"""
-    try:
-        if boat_db is None or boat_db.boats_df is None or len(boat_db.boats_df) == 0:
-            return jsonify({'error': 'Database not available', 'message': 'Boat database not initialized or empty.'}), 500
-        
-        df = boat_db.boats_df
-        
-        def extract_length(dim_str):
-            if pd.isna(dim_str) or dim_str == '' or 'N/A' in str(dim_str):
-                return None
-            try:
-                import re
-                match = re.search(r'(\d+\.?\d*)\s*x', str(dim_str))
-                if match:
-                    return float(match.group(1))
-                return None
-            except:
-                return None
-        
-        lengths = df['dimensions'].apply(extract_length).dropna()
-        
-        if len(lengths) > 0:
-            bins = [0, 5, 8, 10, 12, 15, 20, 30, lengths.max()]
-            labels = ['<5m', '5-8m', '8-10m', '10-12m', '12-15m', '15-20m', '20-30m', '>30m']
-            size_categories = pd.cut(lengths, bins=bins, labels=labels, include_lowest=True)
-            distribution = size_categories.value_counts().sort_index().to_dict()
-            
-            return jsonify({
-                'success': True,
-                'distribution': {str(k): int(v) for k, v in distribution.items()},
-                'stats': {
-                    'min': float(lengths.min()),
-                    'max': float(lengths.max()),
-                    'median': float(lengths.median()),
-                    'mean': float(lengths.mean())
-                }
-            })
-        else:
-            return jsonify({'success': True, 'distribution': {}, 'stats': {}})
-    except Exception as e:
-        return jsonify({'error': f'Error generating size distribution: {str(e)}'}), 500
+    return insight_response('length')
 
 @app.route('/api/data-insights/market-trends')
 def get_market_trends():
     """Get market trends over time"""
+    return insight_response('trends')
+
+@app.route('/api/data-insights/bundle')
+def get_data_insights_bundle():
+    """Get several insights sections in one response (?fields=summary,price,year,length,brand,trends)"""
+    if boat_db is None or boat_db.boats_df is None or len(boat_db.boats_df) == 0:
+        return fast_jsonify({'error': 'Database not available', 'message': 'Boat database not initialized or empty.'}, 500)
+    
+    fields = request.args.get('fields', '')
+    names = [name.strip() for name in fields.split(',') if name.strip()] or list(INSIGHT_BUILDERS)
+    unknown = [name for name in names if name not in INSIGHT_BUILDERS]
+    if unknown:
+        return fast_jsonify({
+            'error': f"Unknown insights fields: {', '.join(unknown)}",
+            'available_fields': list(INSIGHT_BUILDERS)
+        }, 400)
+    
+    names = tuple(dict.fromkeys(names))
+    frame_id = id(boat_db.boats_df)
     try:
-        if boat_db is None or boat_db.boats_df is None or len(boat_db.boats_df) == 0:
-            return jsonify({'error': 'Database not available', 'message': 'Boat database not initialized or empty.'}), 500
-        
-        df = boat_db.boats_df
-        
-        def extract_price(price_str):
-            if pd.isna(price_str) or price_str == '' or 'Price on Request' in str(price_str) or 'Under Offer' in str(price_str):
-                return None
-            try:
-                price_clean = str(price_str).replace('EUR', '').replace(',', '').replace('.', '').replace('-', '').replace(' ', '').strip()
-                import re
-                numbers = re.findall(r'\d+', price_clean)
-                if numbers:
-                    return int(''.join(numbers))
-                return None
-            except:
-                return None
-        
-        def extract_length(dim_str):
-            if pd.isna(dim_str) or dim_str == '' or 'N/A' in str(dim_str):
-                return None
-            try:
-                import re
-                match = re.search(r'(\d+\.?\d*)\s*x', str(dim_str))
-                if match:
-                    return float(match.group(1))
-                return None
-            except:
-                return None
-        
-        df_copy = df.copy()
-        df_copy['price_numeric'] = df_copy['price'].apply(extract_price)
-        df_copy['length_numeric'] = df_copy['dimensions'].apply(extract_length)
-        df_copy['year_numeric'] = pd.to_numeric(df_copy['year_built'], errors='coerce')
-        
-        valid_data = df_copy.dropna(subset=['year_numeric', 'price_numeric'])
-        
-        if len(valid_data) > 0:
-            yearly_stats = valid_data.groupby('year_numeric').agg({
-                'price_numeric': ['count', 'mean', 'median'],
-                'length_numeric': 'mean'
-            }).reset_index()
-            
-            yearly_stats.columns = ['year', 'count', 'avg_price', 'median_price', 'avg_length']
-            
-            trends = {
-                'years': [int(row['year']) for row in yearly_stats.to_dict('records')],
-                'counts': [int(row['count']) for row in yearly_stats.to_dict('records')],
-                'avg_prices': [float(row['avg_price']) for row in yearly_stats.to_dict('records')],
-                'median_prices': [float(row['median_price']) for row in yearly_stats.to_dict('records')],
-                'avg_lengths': [float(row['avg_length']) if pd.notna(row['avg_length']) else None for row in yearly_stats.to_dict('records')]
-            }
-            
-            return jsonify({'success': True, 'trends': trends})
-        else:
-            return jsonify({
-                'success': True,
-                'trends': {
-                    'years': [], 'counts': [], 'avg_prices': [],
-                    'median_prices': [], 'avg_lengths': []
-                }
-            })
-    except Exception as e:
-        return jsonify({'error': f'Error generating market trends: {str(e)}'}), 500
+        return cached_json_response(insight_payload(names, frame_id))
+    except Exception:
+        pass
+    
+    # Some section failed: each one carries its own success/error, like its standalone endpoint
+    insights = {}
+    for name in names:
+        try:
+            insights[name] = insight_section(name, frame_id)
+        except Exception as e:
+            insights[name] = {'error': f'{INSIGHT_BUILDERS[name][1]}: {str(e)}'}
+    
+    return fast_jsonify({'success': True, 'insights': insights})
 
 # Investment Comparison API Endpoints
+FINANCIAL_MAX_AGE = 300  # Seconds browsers/CDNs may reuse investment-comparison responses
+
+def financial_response(obj):
+    """ETagged JSON response that clients may cache briefly (index data changes at most daily)"""
+    # Built per request, so only pay for gzip when the client accepts it
+    return cached_json_response(build_cached_payload(obj, compress=False), max_age=FINANCIAL_MAX_AGE)
+
+# Each year range is computed once per analyzer and data version (analyzer_id is
+# id(boat_market_analyzer), data_version is boat_db.version), so a reload recomputes
+# and entries for old versions simply age out of the LRU
+@functools.lru_cache(maxsize=64)
+def cached_market_performance(start_year, end_year, analyzer_id, data_version):
+    """calculate_market_performance result for one resolved year range"""
+    return boat_market_analyzer.calculate_market_performance(start_year=start_year, end_year=end_year)
+
+@functools.lru_cache(maxsize=64)
+def market_performance_payload(start_year, end_year, analyzer_id, data_version):
+    """Pre-serialized /api/investment-comparison/boat-market body for one resolved year range"""
+    return build_cached_payload({
+        'success': True,
+        'data': cached_market_performance(start_year, end_year, analyzer_id, data_version)
+    })
+
+def market_cache_key():
+    """(analyzer_id, data_version) for the market performance caches"""
+    return id(boat_market_analyzer), boat_db.version if boat_db is not None else 0
+
+def market_years(start_year=None, end_year=None):
+    """Year range with the analyzer's defaults resolved, so it can key the caches"""
+    current_year = datetime.datetime.now().year
+    return (current_year - 5 if start_year is None else start_year,
+            current_year if end_year is None else end_year)
+
+def market_performance(start_year=None, end_year=None):
+    """Boat market performance for a year range (computed once per range and analyzer)"""
+    return cached_market_performance(*market_years(start_year, end_year), *market_cache_key())
+
 @app.route('/api/investment-comparison/financial-indices')
 def get_financial_indices():
     """Get financial indices performance data"""
@@ -1426,43 +1856,29 @@ def get_financial_indices():
         period = request.args.get('period', '5y')
         start_date = request.args.get('start_date', None)
         
-        summary = financial_fetcher.get_comparison_summary(period=period, start_date=start_date)
+        summary = get_financial_fetcher().get_comparison_summary(period=period, start_date=start_date)
         
-        return jsonify({
+        return financial_response({
             'success': True,
             'data': summary
         })
     except Exception as e:
-        return jsonify({'error': f'Error fetching financial indices: {str(e)}'}), 500
+        return fast_jsonify({'error': f'Error fetching financial indices: {str(e)}'}, 500)
 
 @app.route('/api/investment-comparison/boat-market')
 def get_boat_market_performance():
     """Get boat market performance data"""
     try:
         if boat_market_analyzer is None:
-            error_msg = 'Boat market analyzer not available. '
-            if boat_db is None:
-                error_msg += 'Boat database not initialized.'
-            elif boat_db.boats_df is None or len(boat_db.boats_df) == 0:
-                error_msg += 'No boat data available in database.'
-            else:
-                error_msg += 'Initialization failed.'
-            return jsonify({'error': error_msg}), 500
+            return market_analyzer_unavailable()
         
         start_year = request.args.get('start_year', type=int)
         end_year = request.args.get('end_year', type=int)
         
-        performance = boat_market_analyzer.calculate_market_performance(
-            start_year=start_year,
-            end_year=end_year
-        )
-        
-        return jsonify({
-            'success': True,
-            'data': performance
-        })
+        payload = market_performance_payload(*market_years(start_year, end_year), *market_cache_key())
+        return cached_json_response(payload, max_age=FINANCIAL_MAX_AGE)
     except Exception as e:
-        return jsonify({'error': f'Error calculating boat market performance: {str(e)}'}), 500
+        return fast_jsonify({'error': f'Error calculating boat market performance: {str(e)}'}, 500)
 
 @app.route('/api/investment-comparison/comparison')
 def get_investment_comparison():
@@ -1471,21 +1887,15 @@ def get_investment_comparison():
         period = request.args.get('period', '5y')
         start_year = request.args.get('start_year', type=int)
         
-        # Get financial indices data
-        financial_data = financial_fetcher.get_comparison_summary(period=period)
-        
-        # Get boat market data
         if boat_market_analyzer is None:
-            error_msg = 'Boat market analyzer not available. '
-            if boat_db is None:
-                error_msg += 'Boat database not initialized.'
-            elif boat_db.boats_df is None or len(boat_db.boats_df) == 0:
-                error_msg += 'No boat data available in database.'
-            else:
-                error_msg += 'Initialization failed.'
-            return jsonify({'error': error_msg}), 500
+            return market_analyzer_unavailable()
         
-        boat_performance = boat_market_analyzer.calculate_market_performance(start_year=start_year)
+        # Get financial indices data (network-bound, so it runs while the boat data is computed)
+        financial_future = get_search_pool().submit(get_financial_fetcher().get_comparison_summary, period=period)
+        
+        # Get boat market data
+        boat_performance = market_performance(start_year=start_year)
+        financial_data = financial_future.result()
         
         # Calculate comparison metrics
         comparison = {
@@ -1519,12 +1929,12 @@ def get_investment_comparison():
                     'start_year': start_year or (datetime.datetime.now().year - 5)
                 }
         
-        return jsonify({
+        return financial_response({
             'success': True,
             'data': comparison
         })
     except Exception as e:
-        return jsonify({'error': f'Error generating comparison: {str(e)}'}), 500
+        return fast_jsonify({'error': f'Error generating comparison: {str(e)}'}, 500)
 
 @app.route('/api/investment-comparison/historical')
 def get_historical_comparison():
@@ -1533,22 +1943,16 @@ def get_historical_comparison():
         period = request.args.get('period', '5y')
         index_name = request.args.get('index', 'SP500')  # SP500, NASDAQ, BIST100
         
-        # Get financial index historical data
-        financial_historical = financial_fetcher.get_historical_prices(index_name, period)
-        
-        # Get boat market yearly data
         if boat_market_analyzer is None:
-            error_msg = 'Boat market analyzer not available. '
-            if boat_db is None:
-                error_msg += 'Boat database not initialized.'
-            elif boat_db.boats_df is None or len(boat_db.boats_df) == 0:
-                error_msg += 'No boat data available in database.'
-            else:
-                error_msg += 'Initialization failed.'
-            return jsonify({'error': error_msg}), 500
+            return market_analyzer_unavailable()
         
+        # Get financial index historical data (network-bound, so it runs while the boat data is computed)
+        historical_future = get_search_pool().submit(get_financial_fetcher().get_historical_prices, index_name, period)
+        
+        # Get boat market yearly data
         start_year = request.args.get('start_year', type=int)
-        boat_performance = boat_market_analyzer.calculate_market_performance(start_year=start_year)
+        boat_performance = market_performance(start_year=start_year)
+        financial_historical = historical_future.result()
         
         historical_data = {
             'financial_index': {
@@ -1560,54 +1964,49 @@ def get_historical_comparison():
             }
         }
         
-        # Format financial data
+        # Format financial data (column-wise; iterrows builds a Series per row)
         if financial_historical is not None and not financial_historical.empty:
-            for date, row in financial_historical.iterrows():
-                historical_data['financial_index']['data'].append({
-                    'date': date.strftime('%Y-%m-%d'),
-                    'price': float(row['Close']),
-                    'year': date.year
-                })
+            dates = financial_historical.index
+            historical_data['financial_index']['data'] = [
+                {'date': date, 'price': price, 'year': year}
+                for date, price, year in zip(dates.strftime('%Y-%m-%d'),
+                                             financial_historical['Close'].to_numpy(dtype=np.float64).tolist(),
+                                             dates.year.tolist())
+            ]
         
         # Format boat market data
         if 'yearly_data' in boat_performance:
             yearly_data = boat_performance['yearly_data']
-            for i, year in enumerate(yearly_data['years']):
-                historical_data['boat_market']['data'].append({
-                    'year': year,
-                    'avg_price': yearly_data['avg_prices'][i],
-                    'median_price': yearly_data['median_prices'][i],
-                    'count': yearly_data['counts'][i]
-                })
+            historical_data['boat_market']['data'] = [
+                {'year': year, 'avg_price': avg_price, 'median_price': median_price, 'count': count}
+                for year, avg_price, median_price, count in zip(yearly_data['years'], yearly_data['avg_prices'],
+                                                                yearly_data['median_prices'], yearly_data['counts'])
+            ]
         
-        return jsonify({
+        return financial_response({
             'success': True,
             'data': historical_data
         })
     except Exception as e:
-        return jsonify({'error': f'Error fetching historical data: {str(e)}'}), 500
+        return fast_jsonify({'error': f'Error fetching historical data: {str(e)}'}, 500)
 
 # Initialize app when module is imported (for gunicorn/production)
-print("=" * 60)
-print("🚀 Initializing boataniQ App...")
-print("=" * 60)
+logger.info("Initializing boataniQ App")
 initialize_app()
 
 if boat_db is None:
-    print("⚠️  WARNING: Database not initialized. Some features may not work.")
+    logger.warning("Database not initialized. Some features may not work.")
 else:
-    print(f"✅ Database ready with {len(boat_db.boats_df)} boats")
+    logger.info("Database ready with %d boats", len(boat_db.boats_df))
 
 if ai_analyzer is None:
-    print("⚠️  WARNING: AI analyzer not initialized. Image analysis will not work.")
-    print("   Please set GCP_CREDENTIALS_JSON or GEMINI_API_KEY environment variable.")
+    logger.warning("AI analyzer not initialized. Image analysis will not work. "
+                   "Please set GCP_CREDENTIALS_JSON or GEMINI_API_KEY environment variable.")
 else:
-    print("✅ AI analyzer ready")
+    logger.info("AI analyzer ready")
 
-print("=" * 60)
-print("✅ Application initialization complete!")
-print("=" * 60)
+logger.info("Application initialization complete")
 
 if __name__ == '__main__':
-    print("Starting Flask application in development mode...")
+    logger.info("Starting Flask application in development mode")
     app.run(debug=True, host='0.0.0.0', port=5001)
@@ -6,29 +6,24 @@ Uses Google Gemini for multimodal boat recognition and analysis
 import google.generativeai as genai
 import os
 from PIL import Image
-import json
+import orjson
 from typing import Dict, Optional
 import base64
+import re
 from io import BytesIO
 
-class BoatAIAnalyzer:
-    def __init__(self, api_key: str = None):
-        """
-        Initialize the AI analyzer
-        
-        Args:
-            api_key: Google Gemini API key. If None, will try to get from environment
-        """
-        self.api_key = api_key or os.getenv('GEMINI_API_KEY')
-        if not self.api_key:
-            raise ValueError("Gemini API key is required. Set GEMINI_API_KEY environment variable or pass api_key parameter.")
-        
-        # Configure Gemini
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
-        
-        # Define the analysis prompt with validation
-        self.analysis_prompt = """
+from image_preprocessor import YEAR_RE, first_keyword, keyword_pattern, prepare_image
+
+# Fallback-parser vocabularies, in priority order; each is found with one regex scan
+BOAT_TYPES = ('sailing yacht', 'motorboat', 'cruiser', 'speedboat', 'fishing boat', 'catamaran')
+BRANDS = ('bavaria', 'beneteau', 'jeanneau', 'princess', 'sunseeker', 'azimut', 'ferretti')
+BOAT_TYPE_RE = keyword_pattern(BOAT_TYPES)
+BRAND_RE = keyword_pattern(BRANDS)
+# Outermost {...} of a model reply (also skips ```json fences and surrounding prose)
+JSON_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+# Analysis prompt with validation (shared by every analyzer instance)
+ANALYSIS_PROMPT = """
         You are an expert marine analyst. Analyze this boat image and provide detailed information about the boat.
 
         CRITICAL VALIDATION: Before analyzing, you MUST validate the image:
@@ -68,6 +63,24 @@ class BoatAIAnalyzer:
         - If you're uncertain about any detail, indicate that in your response.
         - REJECTION REASONS should be clear and helpful: "Image is too blurry", "This does not appear to be a boat", "Boat is not clearly visible", "Image angle is too extreme", etc.
         """
+
+class BoatAIAnalyzer:
+    def __init__(self, api_key: str = None):
+        """
+        Initialize the AI analyzer
+        
+        Args:
+            api_key: Google Gemini API key. If None, will try to get from environment
+        """
+        self.api_key = api_key or os.getenv('GEMINI_API_KEY')
+        if not self.api_key:
+            raise ValueError("Gemini API key is required. Set GEMINI_API_KEY environment variable or pass api_key parameter.")
+        
+        # Configure Gemini
+        genai.configure(api_key=self.api_key)
+        self.model = genai.GenerativeModel('gemini-1.5-flash')
+        
+        self.analysis_prompt = ANALYSIS_PROMPT
     
     def analyze_boat_image(self, image_path: str) -> Dict:
         """
@@ -80,64 +93,8 @@ class BoatAIAnalyzer:
             Dictionary containing analyzed boat features
         """
         try:
-            # Load and process image
-            image = Image.open(image_path)
-            
-            # Convert to RGB if necessary
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            # Generate analysis
-            response = self.model.generate_content([self.analysis_prompt, image])
-            
-            # Parse response
-            analysis_text = response.text.strip()
-            
-            # Try to extract JSON from response
-            try:
-                # Look for JSON in the response
-                start_idx = analysis_text.find('{')
-                end_idx = analysis_text.rfind('}') + 1
-                
-                if start_idx != -1 and end_idx != -1:
-                    json_str = analysis_text[start_idx:end_idx]
-                    analysis_result = json.loads(json_str)
-                else:
-                    # Fallback: create structured response from text
-                    analysis_result = self._parse_text_response(analysis_text)
-                
-            except json.JSONDecodeError:
-                # Fallback parsing if JSON is malformed
-                analysis_result = self._parse_text_response(analysis_text)
-            
-            # Add metadata
+            analysis_result = self._run_analysis(Image.open(image_path))
             analysis_result['image_path'] = image_path
-            analysis_result['raw_response'] = analysis_text
-            analysis_result['model_used'] = 'gemini-1.5-flash'
-            analysis_result['analyzer_type'] = 'regular_gemini'
-            
-            # Handle validation fields (default to valid if not present)
-            if 'is_valid_image' not in analysis_result:
-                analysis_result['is_valid_image'] = True
-            if 'rejection_reason' not in analysis_result:
-                analysis_result['rejection_reason'] = None
-            
-            # Check confidence threshold
-            confidence = analysis_result.get('confidence', 0)
-            if isinstance(confidence, str):
-                try:
-                    confidence = float(confidence)
-                except:
-                    confidence = 0
-            
-            # If confidence is very low or image is invalid, mark as rejected
-            if not analysis_result.get('is_valid_image', True) or confidence < 30:
-                if not analysis_result.get('rejection_reason'):
-                    if confidence < 30:
-                        analysis_result['rejection_reason'] = 'AI confidence too low - image may be unclear, not a boat, or from a poor angle'
-                    else:
-                        analysis_result['rejection_reason'] = 'Image validation failed'
-            
             return analysis_result
             
         except Exception as e:
@@ -158,64 +115,7 @@ class BoatAIAnalyzer:
             Dictionary containing analyzed boat features
         """
         try:
-            # Convert bytes to PIL Image
-            image = Image.open(BytesIO(image_bytes))
-            
-            # Convert to RGB if necessary
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            # Generate analysis
-            response = self.model.generate_content([self.analysis_prompt, image])
-            
-            # Parse response
-            analysis_text = response.text.strip()
-            
-            # Try to extract JSON from response
-            try:
-                # Look for JSON in the response
-                start_idx = analysis_text.find('{')
-                end_idx = analysis_text.rfind('}') + 1
-                
-                if start_idx != -1 and end_idx != -1:
-                    json_str = analysis_text[start_idx:end_idx]
-                    analysis_result = json.loads(json_str)
-                else:
-                    # Fallback: create structured response from text
-                    analysis_result = self._parse_text_response(analysis_text)
-                
-            except json.JSONDecodeError:
-                # Fallback parsing if JSON is malformed
-                analysis_result = self._parse_text_response(analysis_text)
-            
-            # Add metadata
-            analysis_result['raw_response'] = analysis_text
-            analysis_result['model_used'] = 'gemini-1.5-flash'
-            analysis_result['analyzer_type'] = 'regular_gemini'
-            
-            # Handle validation fields (default to valid if not present)
-            if 'is_valid_image' not in analysis_result:
-                analysis_result['is_valid_image'] = True
-            if 'rejection_reason' not in analysis_result:
-                analysis_result['rejection_reason'] = None
-            
-            # Check confidence threshold
-            confidence = analysis_result.get('confidence', 0)
-            if isinstance(confidence, str):
-                try:
-                    confidence = float(confidence)
-                except:
-                    confidence = 0
-            
-            # If confidence is very low or image is invalid, mark as rejected
-            if not analysis_result.get('is_valid_image', True) or confidence < 30:
-                if not analysis_result.get('rejection_reason'):
-                    if confidence < 30:
-                        analysis_result['rejection_reason'] = 'AI confidence too low - image may be unclear, not a boat, or from a poor angle'
-                    else:
-                        analysis_result['rejection_reason'] = 'Image validation failed'
-            
-            return analysis_result
+            return self._run_analysis(Image.open(BytesIO(image_bytes)))
             
         except Exception as e:
             return {
@@ -223,6 +123,73 @@ class BoatAIAnalyzer:
                 'confidence': 0
             }
     
+    def _run_analysis(self, image: Image.Image) -> Dict:
+        """
+        Send an opened image to Gemini and parse and validate the reply
+        
+        Args:
+            image: PIL image (any mode)
+            
+        Returns:
+            Dictionary containing analyzed boat features
+        """
+        response = self.model.generate_content([self.analysis_prompt, prepare_image(image)])
+        return self._build_result(response.text.strip())
+    
+    def _build_result(self, analysis_text: str) -> Dict:
+        """
+        Parse a Gemini reply and apply the validation rules
+        
+        Args:
+            analysis_text: Stripped response text
+            
+        Returns:
+            Dictionary containing analyzed boat features
+        """
+        # Try to extract JSON from response
+        try:
+            # Look for JSON in the response
+            json_match = JSON_RE.search(analysis_text)
+            
+            if json_match:
+                analysis_result = orjson.loads(json_match.group())
+            else:
+                # Fallback: create structured response from text
+                analysis_result = self._parse_text_response(analysis_text)
+            
+        except orjson.JSONDecodeError:
+            # Fallback parsing if JSON is malformed
+            analysis_result = self._parse_text_response(analysis_text)
+        
+        # Add metadata
+        analysis_result['raw_response'] = analysis_text
+        analysis_result['model_used'] = 'gemini-1.5-flash'
+        analysis_result['analyzer_type'] = 'regular_gemini'
+        
+        # Handle validation fields (default to valid if not present)
+        if 'is_valid_image' not in analysis_result:
+            analysis_result['is_valid_image'] = True
+        if 'rejection_reason' not in analysis_result:
+            analysis_result['rejection_reason'] = None
+        
+        # Check confidence threshold
+        confidence = analysis_result.get('confidence', 0)
+        if isinstance(confidence, str):
+            try:
+                confidence = float(confidence)
+            except:
+                confidence = 0
+        
+        # If confidence is very low or image is invalid, mark as rejected
+        if not analysis_result.get('is_valid_image', True) or confidence < 30:
+            if not analysis_result.get('rejection_reason'):
+                if confidence < 30:
+                    analysis_result['rejection_reason'] = 'AI confidence too low - image may be unclear, not a boat, or from a poor angle'
+                else:
+                    analysis_result['rejection_reason'] = 'Image validation failed'
+        
+        return analysis_result
+    
     def _parse_text_response(self, text: str) -> Dict:
         """
         Parse text response when JSON parsing fails
@@ -252,22 +219,17 @@ class BoatAIAnalyzer:
         text_lower = text.lower()
         
         # Extract boat type
-        boat_types = ['sailing yacht', 'motorboat', 'cruiser', 'speedboat', 'fishing boat', 'catamaran']
-        for boat_type in boat_types:
-            if boat_type in text_lower:
-                result['boat_type'] = boat_type.title()
-                break
+        boat_type = first_keyword(text_lower, BOAT_TYPES, BOAT_TYPE_RE)
+        if boat_type:
+            result['boat_type'] = boat_type.title()
         
         # Extract brand
-        brands = ['bavaria', 'beneteau', 'jeanneau', 'princess', 'sunseeker', 'azimut', 'ferretti']
-        for brand in brands:
-            if brand in text_lower:
-                result['brand'] = brand.title()
-                break
+        brand = first_keyword(text_lower, BRANDS, BRAND_RE)
+        if brand:
+            result['brand'] = brand.title()
         
         # Extract year
-        import re
-        year_match = re.search(r'\b(19|20)\d{2}\b', text)
+        year_match = YEAR_RE.search(text)
         if year_match:
             result['estimated_year'] = year_match.group()
         
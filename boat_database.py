@@ -4,14 +4,57 @@ Handles loading and querying boat data from CSV and JSON files
 """
 
 import pandas as pd
+import numpy as np
 import json
 import os
 import random
+from datetime import datetime, timezone
 from typing import List, Dict, Optional
-from fuzzywuzzy import fuzz, process
+from fuzzywuzzy import fuzz, process, utils
 import re
 from geopy.distance import geodesic
 
+# Placeholder strings that mean "no value" in the scraped CSV (read as NaN)
+NA_VALUES = ['nan', 'NaN', 'None', 'none', 'null', 'NULL', '']
+
+PRICE_UNAVAILABLE_RE = re.compile(r'Price on Request|Under Offer')
+NON_DIGIT_RE = re.compile(r'\D+')
+LENGTH_RE = re.compile(r'(\d+\.?\d*)\s*x')
+YEAR_RE = re.compile(r'\b(19|20)\d{2}\b')
+LENGTH_WIDTH_RE = re.compile(r'(\d+(?:\.\d+)?)\s*x\s*(\d+(?:\.\d+)?)\s*m')
+
+
+def extract_prices(price_series: pd.Series) -> pd.Series:
+    """Numeric prices from listing text (NaN for missing, 'Price on Request' and 'Under Offer')"""
+    text = price_series[price_series.notna()].astype(str)
+    digits = text.str.replace(NON_DIGIT_RE, '', regex=True)
+    digits = digits.mask(text.str.contains(PRICE_UNAVAILABLE_RE) | (digits == ''))
+    return pd.to_numeric(digits).reindex(price_series.index)
+
+
+def extract_lengths(dimensions_series: pd.Series) -> pd.Series:
+    """Length in metres from 'L x W m' dimension text (NaN when not parseable)"""
+    text = dimensions_series[dimensions_series.notna()].astype(str)
+    lengths = text.str.extract(LENGTH_RE, expand=False).astype(float)
+    return lengths.mask(text.str.contains('N/A', regex=False)).reindex(dimensions_series.index)
+
+
+def narrow_array(values: pd.Series, dtype) -> np.ndarray:
+    """NaN-free values as integer dtype if every value fits exactly, else float64"""
+    values = values.dropna().to_numpy(dtype=np.float64)
+    if len(values) > 0:
+        limits = np.iinfo(dtype)
+        if values.min() < limits.min or values.max() > limits.max or not np.all(np.mod(values, 1) == 0):
+            return values
+    return values.astype(dtype)
+
+
+def extract_brands(title_series: pd.Series) -> pd.Series:
+    """First word of each title as the brand (NaN for missing or blank titles)"""
+    text = title_series[title_series.notna()].astype(str)
+    return text.str.split(n=1).str[0].reindex(title_series.index)
+
+
 class BoatDatabase:
     def __init__(self, csv_path: str, json_dir: str = None):
         """
@@ -24,7 +67,11 @@ class BoatDatabase:
         self.csv_path = csv_path
         self.json_dir = json_dir
         self.boats_df = None
+        self.insights_df = None  # Numeric price/length/year and brand per boat, built at load
+        self.insights_arrays = {}
         self.json_boats = {}
+        self.version = 0  # Bumped whenever boats_df is (re)loaded; part of response cache keys
+        self.last_modified = None  # UTC time of the last (re)load, whole seconds like HTTP dates
         
         # Popular boat locations for generating sample data
         self.popular_locations = [
@@ -56,7 +103,7 @@ class BoatDatabase:
         """Load boat data from CSV and JSON files"""
         try:
             # Load main CSV data
-            self.boats_df = pd.read_csv(self.csv_path)
+            self.boats_df = pd.read_csv(self.csv_path, keep_default_na=True, na_values=NA_VALUES)
             print(f"Loaded {len(self.boats_df)} boats from CSV")
             
             # Add location data if not present
@@ -68,6 +115,9 @@ class BoatDatabase:
             # Load individual JSON files if directory provided
             if self.json_dir and os.path.exists(self.json_dir):
                 self._load_json_files()
+            
+            self.version += 1
+            self.last_modified = datetime.now(timezone.utc).replace(microsecond=0)
                 
         except Exception as e: 
             print(f"Error loading boat data: {e}")
@@ -96,6 +146,10 @@ class BoatDatabase:
             self.boats_df['location_lat'] = [random.choice(self.popular_locations)['lat'] for _ in range(len(self.boats_df))]
             self.boats_df['location_lon'] = [random.choice(self.popular_locations)['lon'] for _ in range(len(self.boats_df))]
             self.boats_df['location_country'] = [random.choice(self.popular_locations)['country'] for _ in range(len(self.boats_df))]
+            # Categorical codes are plain integers, so forked workers reading them
+            # don't touch per-row string refcounts and the pages stay shared
+            self.boats_df['location_name'] = self.boats_df['location_name'].astype('category')
+            self.boats_df['location_country'] = self.boats_df['location_country'].astype('category')
             print("Added location data to boats")
     
     def _initialize_extracted_columns(self):
@@ -107,14 +161,14 @@ class BoatDatabase:
         def extract_year(year_str):
             if pd.isna(year_str):
                 return None
-            year_match = re.search(r'\b(19|20)\d{2}\b', str(year_str))
+            year_match = YEAR_RE.search(str(year_str))
             return float(year_match.group()) if year_match else None
         
         # Extract dimensions (length and width)
         def extract_length_width(dimensions_str):
             if pd.isna(dimensions_str):
                 return None, None
-            dim_match = re.search(r'(\d+(?:\.\d+)?)\s*x\s*(\d+(?:\.\d+)?)\s*m', str(dimensions_str))
+            dim_match = LENGTH_WIDTH_RE.search(str(dimensions_str))
             if dim_match:
                 return float(dim_match.group(1)), float(dim_match.group(2))
             return None, None
@@ -128,6 +182,74 @@ class BoatDatabase:
         self.boats_df['width'] = [x[1] if x[1] is not None else None for x in dimensions_extracted]
         
         print("Initialized extracted columns for search")
+        
+        self._build_search_index()
+        self._build_insights_columns()
+        self._build_location_index()
+    
+    def _build_search_index(self):
+        """Precompute lowercase titles and the brand candidates used by the searches"""
+        self._title_lower = self.boats_df['title'].str.lower()
+        
+        # Potential brands: first word or first two words of each title
+        brands = []
+        for title in self.boats_df['title'].dropna():
+            words = title.split()
+            if len(words) >= 1:
+                potential_brand = words[0]
+                if len(words) >= 2:
+                    potential_brand = f"{words[0]} {words[1]}"
+                
+                brands.append(potential_brand)
+        # Sorted rather than set order: process.extract breaks score ties by list
+        # order, so this keeps rankings stable across processes (str hashing is salted)
+        self._brand_candidates = sorted(set(brands))
+        
+        # Normalized brand -> lowercase brand. Only an identical normalized string
+        # scores 100, so the first candidate per key is the one fuzzy matching
+        # would rank first
+        self._brand_lookup = {}
+        for candidate in self._brand_candidates:
+            self._brand_lookup.setdefault(utils.full_process(candidate, force_ascii=True), candidate.lower())
+    
+    def _build_insights_columns(self):
+        """Parse the columns the data-insights endpoints aggregate, once per load
+        
+        Kept beside boats_df (same index) rather than in it, so the parsed values
+        don't show up in the boat records returned by the search endpoints.
+        """
+        brands = extract_brands(self.boats_df['title'])
+        self.insights_df = pd.DataFrame({
+            'price': extract_prices(self.boats_df['price']),
+            'length': extract_lengths(self.boats_df['dimensions']),
+            'year': pd.to_numeric(self.boats_df['year_built'], errors='coerce'),
+            # Categorical, so value_counts/groupby count integer codes instead of hashing
+            # strings; categories in first-seen order keep value_counts ties ordered as before
+            'brand': brands.astype(pd.CategoricalDtype(brands.dropna().unique()))
+        })
+        # Contiguous NaN-free copies for the histogram endpoints. Whole-number
+        # prices and years are stored narrower (a fraction of the bytes per scan)
+        # when that is lossless; lengths keep float64 so reported stats don't
+        # pick up float32 rounding
+        self.insights_arrays = {
+            'price': narrow_array(self.insights_df['price'], np.int32),
+            'length': self.insights_df['length'].dropna().to_numpy(dtype=np.float64),
+            'year': narrow_array(self.insights_df['year'], np.int16)
+        }
+    
+    def _build_location_index(self):
+        """Group boat row positions by coordinate pair for the radius searches"""
+        lats = self.boats_df['location_lat'].to_numpy(dtype=float)
+        lons = self.boats_df['location_lon'].to_numpy(dtype=float)
+        positions = np.flatnonzero(~np.isnan(lats) & ~np.isnan(lons))
+        
+        coords, inverse = np.unique(
+            np.column_stack((lats[positions], lons[positions])), axis=0, return_inverse=True
+        )
+        inverse = inverse.ravel()
+        order = np.argsort(inverse, kind='stable')
+        self._location_coords = coords
+        self._location_positions = np.split(positions[order], np.cumsum(np.bincount(inverse, minlength=len(coords)))[:-1])
     
     def search_by_brand(self, brand: str, limit: int = 10) -> List[Dict]:
         """
@@ -143,26 +265,26 @@ class BoatDatabase:
         if self.boats_df is None:
             return []
         
-        # Extract brand from title using fuzzy matching
-        brands = []
-        for title in self.boats_df['title'].dropna():
-            # Extract potential brand (first word or two)
-            words = title.split()
-            if len(words) >= 1:
-                potential_brand = words[0]
-                if len(words) >= 2:
-                    potential_brand = f"{words[0]} {words[1]}"
-                
-                brands.append(potential_brand)
+        # Fast path: the query is exactly one known brand, so the fuzzy ranking's top
+        # match is that brand and its rows alone fill the result
+        query_key = utils.full_process(brand, force_ascii=True)
+        if brand.isascii() and 0 < len(query_key) < 100:
+            exact_brand = self._brand_lookup.get(query_key)
+            if exact_brand:
+                matching_boats = self.boats_df[
+                    self._title_lower.str.contains(exact_brand, regex=False, na=False)
+                ].head(limit)
+                if len(matching_boats) >= limit:
+                    return [self._boat_row_to_dict(boat) for _, boat in matching_boats.iterrows()]
         
         # Find best brand matches
-        best_matches = process.extract(brand, list(set(brands)), limit=5)
+        best_matches = process.extract(brand, self._brand_candidates, limit=5)
         
         results = []
         for match_brand, score in best_matches:
             if score >= 60:  # Minimum similarity threshold
                 matching_boats = self.boats_df[
-                    self.boats_df['title'].str.contains(match_brand, case=False, na=False)
+                    self._title_lower.str.contains(match_brand.lower(), regex=False, na=False)
                 ].head(limit)
                 
                 for _, boat in matching_boats.iterrows():
@@ -186,7 +308,7 @@ class BoatDatabase:
         
         # Search for boats containing the model name
         matching_boats = self.boats_df[
-            self.boats_df['title'].str.contains(model, case=False, na=False)
+            self._title_lower.str.contains(model.lower(), regex=False, na=False)
         ].head(limit)
         
         results = []
@@ -364,16 +486,14 @@ class BoatDatabase:
         # 1. EXACT title matches (highest priority) - must contain ALL keywords
         keywords_list = keywords_lower.split()
         
-        # Find boats that contain ALL keywords in the title
-        exact_matches = self.boats_df[
-            self.boats_df['title'].str.lower().str.contains('|'.join(keywords_list), na=False)
-        ]
+        # Find boats that contain ALL keywords in the title (literal substring checks)
+        all_keywords_mask = self._title_lower.notna()
+        for keyword in keywords_list:
+            all_keywords_mask &= self._title_lower.str.contains(keyword, regex=False, na=False)
         
-        # Filter to ensure ALL keywords are present
-        for _, boat in exact_matches.iterrows():
-            title_lower = str(boat['title']).lower()
-            if all(keyword in title_lower for keyword in keywords_list):
-                results.append(self._boat_row_to_dict(boat))
+        # Later steps only fill up to limit, so convert no more rows than that
+        for _, boat in self.boats_df[all_keywords_mask].head(limit).iterrows():
+            results.append(self._boat_row_to_dict(boat))
         
         # 2. EXACT brand matches (second priority)
         if len(results) < limit and 'brand' in self.boats_df.columns:
@@ -437,8 +557,8 @@ class BoatDatabase:
         if self.boats_df is None:
             return []
         
-        # Start with all boats
-        filtered_df = self.boats_df.copy()
+        # Start with all boats (each filter below builds a new frame, so no copy is needed)
+        filtered_df = self.boats_df
         
         # Apply keyword search if provided
         if keywords and keywords.strip():
@@ -660,11 +780,16 @@ class BoatDatabase:
                 'width_range': {'min': 0, 'max': 50}
             }
     
+    @staticmethod
+    def _df_to_records(df: pd.DataFrame) -> List[Dict]:
+        """Convert a DataFrame slice to JSON-ready dictionaries with NaN as None"""
+        return df.astype(object).where(df.notna(), None).to_dict(orient='records')
+    
     def _boat_row_to_dict(self, row) -> Dict:
         """Convert pandas row to dictionary"""
         def clean_value(value):
             """Clean NaN and None values for JSON serialization"""
-            if pd.isna(value) or value is None or str(value).lower() == 'nan':
+            if isinstance(value, (float, np.floating)) and value != value:
                 return None
             return value
         
@@ -796,7 +921,7 @@ class BoatDatabase:
         def extract_year_for_stats(year_str):
             if pd.isna(year_str):
                 return None
-            year_match = re.search(r'\b(19|20)\d{2}\b', str(year_str))
+            year_match = YEAR_RE.search(str(year_str))
             return int(year_match.group()) if year_match else None
         
         years = self.boats_df['year_built'].apply(extract_year_for_stats).dropna()
@@ -847,20 +972,39 @@ class BoatDatabase:
         if self.boats_df is None:
             return []
         
-        nearby_boats = []
-        
-        for _, boat in self.boats_df.iterrows():
-            if pd.notna(boat.get('location_lat')) and pd.notna(boat.get('location_lon')):
-                distance = geodesic((lat, lon), (boat['location_lat'], boat['location_lon'])).kilometers
-                
-                if distance <= radius_km:
-                    boat_dict = boat.to_dict()
-                    boat_dict['distance_km'] = round(distance, 2)
-                    nearby_boats.append(boat_dict)
-        
-        # Sort by distance and limit results
-        nearby_boats.sort(key=lambda x: x['distance_km'])
-        return nearby_boats[:limit]
+        coords = self._location_coords
+        
+        # Cheap bounding box first (a degree is never shorter than 110 km of
+        # latitude, or 110 km * cos(lat) of longitude), then the exact geodesic
+        # once per distinct coordinate pair instead of once per boat
+        lat_margin = radius_km / 110.0
+        candidates = np.abs(coords[:, 0] - lat) <= lat_margin
+        max_abs_lat = abs(lat) + lat_margin
+        if max_abs_lat < 89:
+            lon_margin = radius_km / (110.0 * np.cos(np.radians(max_abs_lat)))
+            lon_delta = np.abs((coords[:, 1] - lon + 180) % 360 - 180)
+            candidates &= lon_delta <= lon_margin
+        
+        nearby_positions = []
+        nearby_distances = []
+        for point in np.flatnonzero(candidates):
+            distance = geodesic((lat, lon), (coords[point, 0], coords[point, 1])).kilometers
+            if distance <= radius_km:
+                boat_positions = self._location_positions[point]
+                nearby_positions.append(boat_positions)
+                nearby_distances.append(np.full(len(boat_positions), round(distance, 2)))
+        
+        if not nearby_positions:
+            return []
+        positions = np.concatenate(nearby_positions)
+        distances = np.concatenate(nearby_distances)
+        
+        # Sort by distance (ties keep table order) and limit results
+        order = np.lexsort((positions, distances))[:limit]
+        nearby_boats = self._df_to_records(self.boats_df.iloc[positions[order]])
+        for boat_dict, distance in zip(nearby_boats, distances[order].tolist()):
+            boat_dict['distance_km'] = distance
+        return nearby_boats
     
     def search_by_location_name(self, location_name: str, radius_km: float = 50, limit: int = 20) -> List[Dict]:
         """
@@ -904,20 +1048,11 @@ class BoatDatabase:
         if self.boats_df is None:
             return []
         
-        boats_with_location = []
-        
-        for _, boat in self.boats_df.iterrows():
-            if (pd.notna(boat.get('location_lat')) and 
-                pd.notna(boat.get('location_lon')) and 
-                pd.notna(boat.get('location_name'))):
-                
-                boat_dict = boat.to_dict()
-                boats_with_location.append(boat_dict)
-                
-                if len(boats_with_location) >= limit:
-                    break
+        mask = (self.boats_df['location_lat'].notna() &
+                self.boats_df['location_lon'].notna() &
+                self.boats_df['location_name'].notna())
         
-        return boats_with_location
+        return self._df_to_records(self.boats_df[mask].head(limit))
     
     def get_location_statistics(self) -> Dict:
         """
@@ -4,7 +4,7 @@ Boat Location Analyzer - Detects locations from boat images using AI
 
 import os
 import json
-from typing import Dict, List, Optional, Tuple
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
 from geopy.geocoders import Nominatim
 from geopy.distance import geodesic
 import requests
@@ -37,10 +37,14 @@ class BoatLocationAnalyzer:
             {"name": "Southampton", "lat": 50.9097, "lon": -1.4044, "country": "UK"},
         ]
     
-    def analyze_image_location(self, image_bytes: bytes) -> Dict:
+    def analyze_image_location(self, image: Union[bytes, BinaryIO]) -> Dict:
         """
         Analyze boat image to detect potential location
         For now, we'll simulate location detection and return popular marina locations
+        
+        Args:
+            image: Image bytes or a binary file object positioned at the start
+                   (e.g. the spooled upload), so callers need not read it into memory
         """
         try:
             # Simulate AI analysis - in a real implementation, this would use
@@ -14,6 +14,10 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+PRICE_CHARS_RE = re.compile(r'[^\d.,]')
+NON_NUMERIC_RE = re.compile(r'[^\d.]')
+LENGTH_RE = re.compile(r'(\d+\.?\d*)\s*x')
+
 
 class BoatMarketAnalyzer:
     """Analyzes boat market performance from sales data"""
@@ -25,7 +29,8 @@ class BoatMarketAnalyzer:
         Args:
             boats_df: DataFrame with boat sales data
         """
-        self.boats_df = boats_df.copy()
+        # Shallow copy: only new columns are added, so the caller's data can be shared
+        self.boats_df = boats_df.copy(deep=False)
         self._prepare_data()
     
     def _prepare_data(self):
@@ -66,11 +71,11 @@ class BoatMarketAnalyzer:
         
         try:
             # Remove currency symbols and formatting
-            price_clean = re.sub(r'[^\d.,]', '', price_str)
+            price_clean = PRICE_CHARS_RE.sub('', price_str)
             # Handle European format (1.234.567,89) and US format (1,234,567.89)
             price_clean = price_clean.replace('.', '').replace(',', '.')
             # Remove any remaining non-numeric characters
-            price_clean = re.sub(r'[^\d.]', '', price_clean)
+            price_clean = NON_NUMERIC_RE.sub('', price_clean)
             
             if price_clean:
                 return float(price_clean)
@@ -86,7 +91,7 @@ class BoatMarketAnalyzer:
         
         try:
             # Look for pattern like "12.43 x 4.20 m" or "12.43m x 4.20m"
-            match = re.search(r'(\d+\.?\d*)\s*x', str(dim_str))
+            match = LENGTH_RE.search(str(dim_str))
             if match:
                 return float(match.group(1))
         except:
@@ -176,17 +181,18 @@ class BoatMarketAnalyzer:
                 'start_median_price': round(first_median_price, 2),
                 'end_median_price': round(last_median_price, 2),
                 'total_listings': len(filtered_df),
+                # Whole columns become native Python lists in one step each (no per-element conversion)
                 'yearly_data': {
-                    'years': [int(y) for y in yearly_avg_prices.index],
-                    'avg_prices': [round(p, 2) for p in yearly_avg_prices.values],
-                    'median_prices': [round(p, 2) for p in yearly_median_prices.values],
-                    'counts': [int(c) for c in yearly_counts.values]
+                    'years': yearly_avg_prices.index.to_numpy(dtype=np.int64).tolist(),
+                    'avg_prices': np.round(yearly_avg_prices.to_numpy(dtype=np.float64), 2).tolist(),
+                    'median_prices': np.round(yearly_median_prices.to_numpy(dtype=np.float64), 2).tolist(),
+                    'counts': yearly_counts.to_numpy(dtype=np.int64).tolist()
                 }
             }
         else:
             return {
                 'error': 'Insufficient data for performance calculation',
-                'years_available': [int(y) for y in yearly_avg_prices.index]
+                'years_available': yearly_avg_prices.index.to_numpy(dtype=np.int64).tolist()
             }
     
     def calculate_category_performance(self, category_col: str = 'title', start_year: Optional[int] = None) -> Dict:
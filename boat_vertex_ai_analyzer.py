@@ -5,11 +5,14 @@ Uses Gemini Flash 2.0 for multimodal boat recognition and analysis
 
 import os
 import json
+import orjson
 from typing import Dict, Optional
 from PIL import Image
 from io import BytesIO
 import base64
 
+from image_preprocessor import YEAR_RE, first_keyword, keyword_pattern, prepare_image
+
 try:
     import vertexai
     from vertexai.generative_models import GenerativeModel, Part
@@ -18,8 +21,15 @@ try:
 except ImportError:
     VERTEX_AI_AVAILABLE = False
 
+# Fallback-parser vocabularies, in priority order; each is found with one regex scan
+BOAT_TYPES = ('sailing yacht', 'motor yacht', 'cruiser', 'sport boat', 'fishing boat', 'catamaran', 'speedboat', 'motorboat')
+BRANDS = ('bavaria', 'beneteau', 'jeanneau', 'princess', 'sunseeker', 'azimut', 'ferretti', 'pershing', 'riva', 'sea ray')
+BOAT_TYPE_RE = keyword_pattern(BOAT_TYPES)
+BRAND_RE = keyword_pattern(BRANDS)
+
 class BoatVertexAIAnalyzer:
-    def __init__(self, credentials_path: str = None, credentials_json: str = None, project_id: str = None, location: str = "us-central1"):
+    def __init__(self, credentials_path: str = None, credentials_json: str = None, project_id: str = None, location: str = "us-central1",
+                 credentials_dict: Dict = None):
         """
         Initialize the Vertex AI analyzer
         
@@ -28,6 +38,7 @@ class BoatVertexAIAnalyzer:
             credentials_json: JSON string of credentials (for deployment, optional)
             project_id: Google Cloud project ID (will be extracted from credentials if not provided)
             location: Google Cloud region for Vertex AI
+            credentials_dict: Already-parsed credentials (preferred over credentials_json, optional)
         """
         if not VERTEX_AI_AVAILABLE:
             raise ImportError("Google Cloud Vertex AI libraries not installed. Run: pip install google-cloud-aiplatform")
@@ -36,21 +47,23 @@ class BoatVertexAIAnalyzer:
         credentials_data = None
         
         # Try to get credentials from different sources
-        if credentials_json:
+        if credentials_dict:
+            # Use credentials the caller already parsed
+            credentials_data = credentials_dict
+        elif credentials_json:
             # Use credentials from JSON string (for deployment)
             credentials_data = json.loads(credentials_json)
-            self.project_id = project_id or credentials_data.get('project_id')
-            # Create credentials from dict
-            credentials = service_account.Credentials.from_service_account_info(credentials_data)
         elif credentials_path and os.path.exists(credentials_path):
             # Use credentials from file path (local development)
             self.credentials_path = credentials_path
             with open(credentials_path, 'r') as f:
                 credentials_data = json.load(f)
-            self.project_id = project_id or credentials_data.get('project_id')
-            credentials = service_account.Credentials.from_service_account_file(credentials_path)
         else:
-            raise FileNotFoundError("Credentials not found. Please provide credentials_path or credentials_json")
+            raise FileNotFoundError("Credentials not found. Please provide credentials_path, credentials_json or credentials_dict")
+        
+        self.project_id = project_id or credentials_data.get('project_id')
+        # Create credentials from the parsed dict (the file is only read once)
+        credentials = service_account.Credentials.from_service_account_info(credentials_data)
         
         if not self.project_id:
             raise ValueError("Project ID not found in credentials")
@@ -167,11 +180,7 @@ class BoatVertexAIAnalyzer:
         """
         try:
             # Load and process image
-            image = Image.open(image_path)
-            
-            # Convert to RGB if necessary
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
+            image = prepare_image(Image.open(image_path))
             
             # Convert image to base64 for Vertex AI
             buffer = BytesIO()
@@ -198,12 +207,12 @@ class BoatVertexAIAnalyzer:
                 
                 if start_idx != -1 and end_idx != -1:
                     json_str = analysis_text[start_idx:end_idx]
-                    analysis_result = json.loads(json_str)
+                    analysis_result = orjson.loads(json_str)
                 else:
                     # Fallback: create structured response from text
                     analysis_result = self._parse_text_response(analysis_text)
                 
-            except json.JSONDecodeError as e:
+            except orjson.JSONDecodeError as e:
                 print(f"JSON parsing error: {e}")
                 # Fallback parsing if JSON is malformed
                 analysis_result = self._parse_text_response(analysis_text)
@@ -237,11 +246,7 @@ class BoatVertexAIAnalyzer:
         """
         try:
             # Convert bytes to PIL Image
-            image = Image.open(BytesIO(image_bytes))
-            
-            # Convert to RGB if necessary
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
+            image = prepare_image(Image.open(BytesIO(image_bytes)))
             
             # Convert image to JPEG bytes for Vertex AI
             buffer = BytesIO()
@@ -268,12 +273,12 @@ class BoatVertexAIAnalyzer:
                 
                 if start_idx != -1 and end_idx != -1:
                     json_str = analysis_text[start_idx:end_idx]
-                    analysis_result = json.loads(json_str)
+                    analysis_result = orjson.loads(json_str)
                 else:
                     # Fallback: create structured response from text
                     analysis_result = self._parse_text_response(analysis_text)
                 
-            except json.JSONDecodeError as e:
+            except orjson.JSONDecodeError as e:
                 print(f"JSON parsing error: {e}")
                 # Fallback parsing if JSON is malformed
                 analysis_result = self._parse_text_response(analysis_text)
@@ -347,22 +352,17 @@ class BoatVertexAIAnalyzer:
         text_lower = text.lower()
         
         # Extract boat type
-        boat_types = ['sailing yacht', 'motor yacht', 'cruiser', 'sport boat', 'fishing boat', 'catamaran', 'speedboat', 'motorboat']
-        for boat_type in boat_types:
-            if boat_type in text_lower:
-                result['boat_type'] = boat_type.title()
-                break
+        boat_type = first_keyword(text_lower, BOAT_TYPES, BOAT_TYPE_RE)
+        if boat_type:
+            result['boat_type'] = boat_type.title()
         
         # Extract brand
-        brands = ['bavaria', 'beneteau', 'jeanneau', 'princess', 'sunseeker', 'azimut', 'ferretti', 'pershing', 'riva', 'sea ray']
-        for brand in brands:
-            if brand in text_lower:
-                result['brand'] = brand.title()
-                break
+        brand = first_keyword(text_lower, BRANDS, BRAND_RE)
+        if brand:
+            result['brand'] = brand.title()
         
         # Extract year
-        import re
-        year_match = re.search(r'\b(19|20)\d{2}\b', text)
+        year_match = YEAR_RE.search(text)
         if year_match:
             result['estimated_year'] = year_match.group()
         
@@ -2,367 +2,320 @@
 Script to create cost analysis document for Gemini models
 """
 
+from xml.sax.saxutils import escape
+
 from docx import Document
-from docx.shared import Pt, Inches, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from docx.shared import Emu, Pt, RGBColor
+
+TABLE_STYLE_ID = 'LightGrid-Accent1'  # 'Light Grid Accent 1' in the default template
+
+# Font sizes and colors, built once rather than per paragraph
+SUBTITLE_SIZE = Pt(14)
+BODY_SIZE = Pt(11)
+NOTE_SIZE = Pt(10)
+FOOTER_SIZE = Pt(9)
+GREY_TEXT = RGBColor(100, 100, 100)
+GREY_FOOTER = RGBColor(150, 150, 150)
+BOLD_RPR = '<w:rPr><w:b/></w:rPr>'
+
+SPACER_XML = '<w:p/>'
+PAGE_BREAK_XML = '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+
+# Usage assumptions shared by every model; all costs in the report derive from these
+TOKENS_IN = 2_000
+TOKENS_OUT = 2_800
+MONTHLY_COUNTS = (1_000, 5_000, 10_000)
+
+# Report content per model, prices in dollars per million tokens;
+# model_section_xml renders one section from each entry
+MODELS = [
+    {
+        'title': 'Gemini 2.0 Flash Exp Model Analysis',
+        'name': 'Gemini 2.0 Flash',
+        'price_in': 0.10,
+        'price_out': 0.40,
+    },
+    {
+        'title': 'Gemini 3 Flash Model Analysis',
+        'name': 'Gemini 3 Flash',
+        'price_in': 0.50,
+        'price_out': 3.00,
+    },
+]
+
+# Token usage is the same for every model
+TOKEN_ROWS = [
+    ['Component', 'Tokens'],
+    ['Image Encoding', '~1,290 tokens'],
+    ['Prompt Text', '~700 tokens'],
+    ['Output Response', f'~{TOKENS_OUT:,} tokens'],
+]
+
+
+def rpr_xml(bold=False, italic=False, size=None, color=None):
+    """Run properties in schema order, or nothing for an unformatted run"""
+    props = (
+        ('<w:b/>' if bold else '')
+        + ('<w:i/>' if italic else '')
+        + (f'<w:color w:val="{color}"/>' if color is not None else '')
+        + (f'<w:sz w:val="{round(size.pt * 2)}"/>' if size is not None else '')
+    )
+    return f'<w:rPr>{props}</w:rPr>' if props else ''
+
+
+def paragraph_xml(text, style_id=None, center=False, rpr=''):
+    """WordprocessingML for a paragraph holding one run of text"""
+    ppr = (
+        (f'<w:pStyle w:val="{style_id}"/>' if style_id else '')
+        + ('<w:jc w:val="center"/>' if center else '')
+    )
+    return (
+        f'<w:p>{f"<w:pPr>{ppr}</w:pPr>" if ppr else ""}'
+        f'<w:r>{rpr}<w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>'
+    )
+
+
+def heading_xml(text, level, center=False):
+    """Paragraph in the Title (level 0) or Heading N style, as doc.add_heading would add it"""
+    return paragraph_xml(text, HEADING_STYLE_IDS[level], center)
+
+
+def table_xml(rows, bold_rows=()):
+    """WordprocessingML for a full-width grid table, one text run per cell (rows of cell strings, header first)
+
+    Rows whose index is in bold_rows get bold runs.
+    """
+    col_width = TABLE_WIDTH // len(rows[0])
+    grid = ''.join(f'<w:gridCol w:w="{col_width}"/>' for _ in rows[0])
+    body = ''.join(
+        '<w:tr>' + ''.join(
+            f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{col_width}"/></w:tcPr>'
+            f'<w:p><w:r>{BOLD_RPR if index in bold_rows else ""}'
+            f'<w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p></w:tc>'
+            for text in row
+        ) + '</w:tr>'
+        for index, row in enumerate(rows)
+    )
+    return (
+        f'<w:tbl><w:tblPr><w:tblStyle w:val="{TABLE_STYLE_ID}"/><w:tblW w:type="auto" w:w="0"/>'
+        '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0" w:noHBand="0" w:noVBand="1" w:val="04A0"/>'
+        f'</w:tblPr><w:tblGrid>{grid}</w:tblGrid>{body}</w:tbl>'
+    )
+
+
+def bullets_xml(items, size, color=None):
+    """WordprocessingML for 'List Bullet' paragraphs sharing one run format"""
+    rpr = rpr_xml(size=size, color=color)
+    return ''.join(paragraph_xml(text, LIST_BULLET_STYLE_ID, rpr=rpr) for text in items)
+
+
+def runs_xml(runs):
+    """WordprocessingML runs for (text, bold) pairs, newlines as line breaks like python-docx writes them"""
+    return ''.join(
+        f'<w:r>{BOLD_RPR if bold else ""}'
+        + '<w:br/>'.join(
+            f'<w:t xml:space="preserve">{escape(line)}</w:t>' if line else '' for line in text.split('\n')
+        )
+        + '</w:r>'
+        for text, bold in runs
+    )
+
+
+def add_blocks(xml):
+    """Parse body-level WordprocessingML once and append all of it to the document"""
+    blocks = list(parse_xml(f'<w:body {nsdecls("w")}>{xml}</w:body>'))
+    body = doc.element.body
+    position = body.index(body.sectPr)
+    body[position:position] = blocks
+    return blocks
+
+
+def token_cost(tokens, price):
+    """Dollar cost of a token count at a per-million-token price"""
+    return tokens / 1_000_000 * price
+
+
+def cost_per_analysis(model):
+    """Dollar cost of one analysis with the model's input and output prices"""
+    return token_cost(TOKENS_IN, model['price_in']) + token_cost(TOKENS_OUT, model['price_out'])
+
+
+def scenarios_xml(model):
+    """Heading and metrics table for each monthly usage scenario"""
+    per_analysis = cost_per_analysis(model)
+    return ''.join(
+        heading_xml(f'Scenario {number}: {count:,} Monthly Analyses', 3)
+        + table_xml([
+            ['Metric', 'Value'],
+            ['Input Tokens (monthly)', f'{count * TOKENS_IN:,} tokens'],
+            ['Output Tokens (monthly)', f'{count * TOKENS_OUT:,} tokens'],
+            ['Monthly Cost', f'${count * per_analysis:,.2f}'],
+        ], bold_rows={3})
+        for number, count in enumerate(MONTHLY_COUNTS, 1)
+    )
+
+
+def model_section_xml(model):
+    """Pricing, token usage, per-analysis cost, scenarios and summary for one model"""
+    price_in, price_out = model['price_in'], model['price_out']
+    cost_in, cost_out = token_cost(TOKENS_IN, price_in), token_cost(TOKENS_OUT, price_out)
+    return ''.join([
+        heading_xml(model['title'], 1),
+        
+        # Pricing
+        heading_xml('Pricing Structure', 2),
+        table_xml([
+            ['Token Type', 'Price per Million Tokens'],
+            ['Input Tokens', f'${price_in:.2f}'],
+            ['Output Tokens', f'${price_out:.2f}'],
+        ]),
+        
+        # Token Usage
+        heading_xml('Token Usage per Analysis', 2),
+        table_xml(TOKEN_ROWS),
+        SPACER_XML,
+        paragraph_xml(
+            f'Total per Analysis: {TOKENS_IN:,} input tokens + {TOKENS_OUT:,} output tokens = '
+            f'{TOKENS_IN + TOKENS_OUT:,} tokens',
+            rpr=BOLD_RPR,
+        ),
+        
+        # Cost per Analysis
+        heading_xml('Cost per Analysis', 2),
+        '<w:p>' + runs_xml([
+            ('Input Cost: ', True),
+            (f'({TOKENS_IN:,} / 1,000,000) × ${price_in:.2f} = ${cost_in:.5f}\n', False),
+            ('Output Cost: ', True),
+            (f'({TOKENS_OUT:,} / 1,000,000) × ${price_out:.2f} = ${cost_out:.5f}\n', False),
+            ('Total Cost per Analysis: ', True),
+            (f'${cost_in + cost_out:.5f}', False),
+        ]) + '</w:p>',
+        
+        # Monthly Scenarios
+        heading_xml('Monthly Cost Scenarios', 2),
+        scenarios_xml(model),
+        
+        # Summary Table
+        heading_xml(f"{model['name']} - Summary", 2),
+        table_xml(
+            [['Monthly Analyses', 'Input Cost', 'Output Cost', 'Total Monthly Cost']] + [
+                [f'{count:,}', f'${count * cost_in:,.2f}', f'${count * cost_out:,.2f}',
+                 f'${count * (cost_in + cost_out):,.2f}']
+                for count in MONTHLY_COUNTS
+            ],
+            bold_rows={0},
+        ),
+        SPACER_XML,
+        paragraph_xml('Annual Costs: ' + ' | '.join(
+            f'{count:,}/month = ${count * (cost_in + cost_out) * 12:,.2f}' for count in MONTHLY_COUNTS
+        ), rpr=rpr_xml(italic=True)),
+        
+        PAGE_BREAK_XML,
+    ])
+
 
 # Create document
 doc = Document()
+LIST_BULLET_STYLE_ID = doc.styles['List Bullet'].style_id
+HEADING_STYLE_IDS = [doc.styles['Title'].style_id] + [
+    doc.styles[f'Heading {level}'].style_id for level in (1, 2, 3)
+]
+section = doc.sections[-1]
+TABLE_WIDTH = Emu(section.page_width - section.left_margin - section.right_margin).twips  # twips
+
+# The whole body is collected as WordprocessingML fragments and parsed in one go at the end
+body_xml = []
 
 # Title
-title = doc.add_heading('BoataniQ - AI Model Cost Analysis', 0)
-title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+body_xml.append(heading_xml('BoataniQ - AI Model Cost Analysis', 0, center=True))
 
 # Subtitle
-subtitle = doc.add_paragraph('Comprehensive Cost Estimation for Gemini 2.0 Flash and Gemini 3 Flash Models')
-subtitle.alignment = WD_ALIGN_PARAGRAPH.CENTER
-subtitle_format = subtitle.runs[0]
-subtitle_format.font.size = Pt(14)
-subtitle_format.font.color.rgb = RGBColor(100, 100, 100)
+body_xml.append(paragraph_xml(
+    'Comprehensive Cost Estimation for Gemini 2.0 Flash and Gemini 3 Flash Models',
+    center=True,
+    rpr=rpr_xml(size=SUBTITLE_SIZE, color=GREY_TEXT),
+))
 
-doc.add_paragraph()  # Spacing
+body_xml.append(SPACER_XML)
 
 # Executive Summary
-doc.add_heading('Executive Summary', 1)
-summary = doc.add_paragraph(
+body_xml.append(heading_xml('Executive Summary', 1))
+body_xml.append(paragraph_xml(
     'This document provides detailed cost analysis for boat image analysis using Google Vertex AI Gemini models. '
     'Calculations are based on current pricing as of January 2025 and include three usage scenarios: '
-    '1,000, 5,000, and 10,000 monthly boat image analyses.'
-)
-summary_format = summary.runs[0]
-summary_format.font.size = Pt(11)
+    '1,000, 5,000, and 10,000 monthly boat image analyses.',
+    rpr=rpr_xml(size=BODY_SIZE),
+))
 
-doc.add_paragraph()  # Spacing
-
-# ============================================
-# GEMINI 2.0 FLASH EXP SECTION
-# ============================================
-doc.add_heading('Gemini 2.0 Flash Exp Model Analysis', 1)
-
-# Pricing
-doc.add_heading('Pricing Structure', 2)
-pricing_table = doc.add_table(rows=3, cols=2)
-pricing_table.style = 'Light Grid Accent 1'
-pricing_table.rows[0].cells[0].text = 'Token Type'
-pricing_table.rows[0].cells[1].text = 'Price per Million Tokens'
-pricing_table.rows[1].cells[0].text = 'Input Tokens'
-pricing_table.rows[1].cells[1].text = '$0.10'
-pricing_table.rows[2].cells[0].text = 'Output Tokens'
-pricing_table.rows[2].cells[1].text = '$0.40'
-
-# Token Usage
-doc.add_heading('Token Usage per Analysis', 2)
-token_table = doc.add_table(rows=4, cols=2)
-token_table.style = 'Light Grid Accent 1'
-token_table.rows[0].cells[0].text = 'Component'
-token_table.rows[0].cells[1].text = 'Tokens'
-token_table.rows[1].cells[0].text = 'Image Encoding'
-token_table.rows[1].cells[1].text = '~1,290 tokens'
-token_table.rows[2].cells[0].text = 'Prompt Text'
-token_table.rows[2].cells[1].text = '~700 tokens'
-token_table.rows[3].cells[0].text = 'Output Response'
-token_table.rows[3].cells[1].text = '~2,800 tokens'
-
-doc.add_paragraph()
-total_tokens = doc.add_paragraph('Total per Analysis: 2,000 input tokens + 2,800 output tokens = 4,800 tokens')
-total_tokens.runs[0].bold = True
-
-# Cost per Analysis
-doc.add_heading('Cost per Analysis', 2)
-cost_calc = doc.add_paragraph()
-cost_calc.add_run('Input Cost: ').bold = True
-cost_calc.add_run('(2,000 / 1,000,000) × $0.10 = $0.00020\n')
-cost_calc.add_run('Output Cost: ').bold = True
-cost_calc.add_run('(2,800 / 1,000,000) × $0.40 = $0.00112\n')
-cost_calc.add_run('Total Cost per Analysis: ').bold = True
-cost_calc.add_run('$0.00132')
-
-# Monthly Scenarios
-doc.add_heading('Monthly Cost Scenarios', 2)
-
-# Scenario 1
-doc.add_heading('Scenario 1: 1,000 Monthly Analyses', 3)
-scenario1_table = doc.add_table(rows=4, cols=2)
-scenario1_table.style = 'Light Grid Accent 1'
-scenario1_table.rows[0].cells[0].text = 'Metric'
-scenario1_table.rows[0].cells[1].text = 'Value'
-scenario1_table.rows[1].cells[0].text = 'Input Tokens (monthly)'
-scenario1_table.rows[1].cells[1].text = '2,000,000 tokens'
-scenario1_table.rows[2].cells[0].text = 'Output Tokens (monthly)'
-scenario1_table.rows[2].cells[1].text = '2,800,000 tokens'
-scenario1_table.rows[3].cells[0].text = 'Monthly Cost'
-scenario1_table.rows[3].cells[1].text = '$1.32'
-scenario1_table.rows[3].cells[0].paragraphs[0].runs[0].bold = True
-scenario1_table.rows[3].cells[1].paragraphs[0].runs[0].bold = True
-
-# Scenario 2
-doc.add_heading('Scenario 2: 5,000 Monthly Analyses', 3)
-scenario2_table = doc.add_table(rows=4, cols=2)
-scenario2_table.style = 'Light Grid Accent 1'
-scenario2_table.rows[0].cells[0].text = 'Metric'
-scenario2_table.rows[0].cells[1].text = 'Value'
-scenario2_table.rows[1].cells[0].text = 'Input Tokens (monthly)'
-scenario2_table.rows[1].cells[1].text = '10,000,000 tokens'
-scenario2_table.rows[2].cells[0].text = 'Output Tokens (monthly)'
-scenario2_table.rows[2].cells[1].text = '14,000,000 tokens'
-scenario2_table.rows[3].cells[0].text = 'Monthly Cost'
-scenario2_table.rows[3].cells[1].text = '$6.60'
-scenario2_table.rows[3].cells[0].paragraphs[0].runs[0].bold = True
-scenario2_table.rows[3].cells[1].paragraphs[0].runs[0].bold = True
-
-# Scenario 3
-doc.add_heading('Scenario 3: 10,000 Monthly Analyses', 3)
-scenario3_table = doc.add_table(rows=4, cols=2)
-scenario3_table.style = 'Light Grid Accent 1'
-scenario3_table.rows[0].cells[0].text = 'Metric'
-scenario3_table.rows[0].cells[1].text = 'Value'
-scenario3_table.rows[1].cells[0].text = 'Input Tokens (monthly)'
-scenario3_table.rows[1].cells[1].text = '20,000,000 tokens'
-scenario3_table.rows[2].cells[0].text = 'Output Tokens (monthly)'
-scenario3_table.rows[2].cells[1].text = '28,000,000 tokens'
-scenario3_table.rows[3].cells[0].text = 'Monthly Cost'
-scenario3_table.rows[3].cells[1].text = '$13.20'
-scenario3_table.rows[3].cells[0].paragraphs[0].runs[0].bold = True
-scenario3_table.rows[3].cells[1].paragraphs[0].runs[0].bold = True
-
-# Summary Table
-doc.add_heading('Gemini 2.0 Flash - Summary', 2)
-summary_table = doc.add_table(rows=4, cols=4)
-summary_table.style = 'Light Grid Accent 1'
-summary_table.rows[0].cells[0].text = 'Monthly Analyses'
-summary_table.rows[0].cells[1].text = 'Input Cost'
-summary_table.rows[0].cells[2].text = 'Output Cost'
-summary_table.rows[0].cells[3].text = 'Total Monthly Cost'
-for i in range(4):
-    summary_table.rows[0].cells[i].paragraphs[0].runs[0].bold = True
-
-summary_table.rows[1].cells[0].text = '1,000'
-summary_table.rows[1].cells[1].text = '$0.20'
-summary_table.rows[1].cells[2].text = '$1.12'
-summary_table.rows[1].cells[3].text = '$1.32'
-
-summary_table.rows[2].cells[0].text = '5,000'
-summary_table.rows[2].cells[1].text = '$1.00'
-summary_table.rows[2].cells[2].text = '$5.60'
-summary_table.rows[2].cells[3].text = '$6.60'
-
-summary_table.rows[3].cells[0].text = '10,000'
-summary_table.rows[3].cells[1].text = '$2.00'
-summary_table.rows[3].cells[2].text = '$11.20'
-summary_table.rows[3].cells[3].text = '$13.20'
-
-doc.add_paragraph()
-annual_note = doc.add_paragraph('Annual Costs: 1,000/month = $15.84 | 5,000/month = $79.20 | 10,000/month = $158.40')
-annual_note.runs[0].italic = True
-
-doc.add_page_break()
+body_xml.append(SPACER_XML)
 
 # ============================================
-# GEMINI 3 FLASH SECTION
+# PER-MODEL SECTIONS
 # ============================================
-doc.add_heading('Gemini 3 Flash Model Analysis', 1)
-
-# Pricing
-doc.add_heading('Pricing Structure', 2)
-pricing_table3 = doc.add_table(rows=3, cols=2)
-pricing_table3.style = 'Light Grid Accent 1'
-pricing_table3.rows[0].cells[0].text = 'Token Type'
-pricing_table3.rows[0].cells[1].text = 'Price per Million Tokens'
-pricing_table3.rows[1].cells[0].text = 'Input Tokens'
-pricing_table3.rows[1].cells[1].text = '$0.50'
-pricing_table3.rows[2].cells[0].text = 'Output Tokens'
-pricing_table3.rows[2].cells[1].text = '$3.00'
-
-# Token Usage (same as 2.0)
-doc.add_heading('Token Usage per Analysis', 2)
-token_table3 = doc.add_table(rows=4, cols=2)
-token_table3.style = 'Light Grid Accent 1'
-token_table3.rows[0].cells[0].text = 'Component'
-token_table3.rows[0].cells[1].text = 'Tokens'
-token_table3.rows[1].cells[0].text = 'Image Encoding'
-token_table3.rows[1].cells[1].text = '~1,290 tokens'
-token_table3.rows[2].cells[0].text = 'Prompt Text'
-token_table3.rows[2].cells[1].text = '~700 tokens'
-token_table3.rows[3].cells[0].text = 'Output Response'
-token_table3.rows[3].cells[1].text = '~2,800 tokens'
-
-doc.add_paragraph()
-total_tokens3 = doc.add_paragraph('Total per Analysis: 2,000 input tokens + 2,800 output tokens = 4,800 tokens')
-total_tokens3.runs[0].bold = True
-
-# Cost per Analysis
-doc.add_heading('Cost per Analysis', 2)
-cost_calc3 = doc.add_paragraph()
-cost_calc3.add_run('Input Cost: ').bold = True
-cost_calc3.add_run('(2,000 / 1,000,000) × $0.50 = $0.00100\n')
-cost_calc3.add_run('Output Cost: ').bold = True
-cost_calc3.add_run('(2,800 / 1,000,000) × $3.00 = $0.00840\n')
-cost_calc3.add_run('Total Cost per Analysis: ').bold = True
-cost_calc3.add_run('$0.00940')
-
-# Monthly Scenarios
-doc.add_heading('Monthly Cost Scenarios', 2)
-
-# Scenario 1
-doc.add_heading('Scenario 1: 1,000 Monthly Analyses', 3)
-scenario1_table3 = doc.add_table(rows=4, cols=2)
-scenario1_table3.style = 'Light Grid Accent 1'
-scenario1_table3.rows[0].cells[0].text = 'Metric'
-scenario1_table3.rows[0].cells[1].text = 'Value'
-scenario1_table3.rows[1].cells[0].text = 'Input Tokens (monthly)'
-scenario1_table3.rows[1].cells[1].text = '2,000,000 tokens'
-scenario1_table3.rows[2].cells[0].text = 'Output Tokens (monthly)'
-scenario1_table3.rows[2].cells[1].text = '2,800,000 tokens'
-scenario1_table3.rows[3].cells[0].text = 'Monthly Cost'
-scenario1_table3.rows[3].cells[1].text = '$9.40'
-scenario1_table3.rows[3].cells[0].paragraphs[0].runs[0].bold = True
-scenario1_table3.rows[3].cells[1].paragraphs[0].runs[0].bold = True
-
-# Scenario 2
-doc.add_heading('Scenario 2: 5,000 Monthly Analyses', 3)
-scenario2_table3 = doc.add_table(rows=4, cols=2)
-scenario2_table3.style = 'Light Grid Accent 1'
-scenario2_table3.rows[0].cells[0].text = 'Metric'
-scenario2_table3.rows[0].cells[1].text = 'Value'
-scenario2_table3.rows[1].cells[0].text = 'Input Tokens (monthly)'
-scenario2_table3.rows[1].cells[1].text = '10,000,000 tokens'
-scenario2_table3.rows[2].cells[0].text = 'Output Tokens (monthly)'
-scenario2_table3.rows[2].cells[1].text = '14,000,000 tokens'
-scenario2_table3.rows[3].cells[0].text = 'Monthly Cost'
-scenario2_table3.rows[3].cells[1].text = '$47.00'
-scenario2_table3.rows[3].cells[0].paragraphs[0].runs[0].bold = True
-scenario2_table3.rows[3].cells[1].paragraphs[0].runs[0].bold = True
-
-# Scenario 3
-doc.add_heading('Scenario 3: 10,000 Monthly Analyses', 3)
-scenario3_table3 = doc.add_table(rows=4, cols=2)
-scenario3_table3.style = 'Light Grid Accent 1'
-scenario3_table3.rows[0].cells[0].text = 'Metric'
-scenario3_table3.rows[0].cells[1].text = 'Value'
-scenario3_table3.rows[1].cells[0].text = 'Input Tokens (monthly)'
-scenario3_table3.rows[1].cells[1].text = '20,000,000 tokens'
-scenario3_table3.rows[2].cells[0].text = 'Output Tokens (monthly)'
-scenario3_table3.rows[2].cells[1].text = '28,000,000 tokens'
-scenario3_table3.rows[3].cells[0].text = 'Monthly Cost'
-scenario3_table3.rows[3].cells[1].text = '$94.00'
-scenario3_table3.rows[3].cells[0].paragraphs[0].runs[0].bold = True
-scenario3_table3.rows[3].cells[1].paragraphs[0].runs[0].bold = True
-
-# Summary Table
-doc.add_heading('Gemini 3 Flash - Summary', 2)
-summary_table3 = doc.add_table(rows=4, cols=4)
-summary_table3.style = 'Light Grid Accent 1'
-summary_table3.rows[0].cells[0].text = 'Monthly Analyses'
-summary_table3.rows[0].cells[1].text = 'Input Cost'
-summary_table3.rows[0].cells[2].text = 'Output Cost'
-summary_table3.rows[0].cells[3].text = 'Total Monthly Cost'
-for i in range(4):
-    summary_table3.rows[0].cells[i].paragraphs[0].runs[0].bold = True
-
-summary_table3.rows[1].cells[0].text = '1,000'
-summary_table3.rows[1].cells[1].text = '$1.00'
-summary_table3.rows[1].cells[2].text = '$8.40'
-summary_table3.rows[1].cells[3].text = '$9.40'
-
-summary_table3.rows[2].cells[0].text = '5,000'
-summary_table3.rows[2].cells[1].text = '$5.00'
-summary_table3.rows[2].cells[2].text = '$42.00'
-summary_table3.rows[2].cells[3].text = '$47.00'
-
-summary_table3.rows[3].cells[0].text = '10,000'
-summary_table3.rows[3].cells[1].text = '$10.00'
-summary_table3.rows[3].cells[2].text = '$84.00'
-summary_table3.rows[3].cells[3].text = '$94.00'
-
-doc.add_paragraph()
-annual_note3 = doc.add_paragraph('Annual Costs: 1,000/month = $112.80 | 5,000/month = $564.00 | 10,000/month = $1,128.00')
-annual_note3.runs[0].italic = True
-
-doc.add_page_break()
+body_xml.extend(model_section_xml(model) for model in MODELS)
 
 # ============================================
 # COMPARISON SECTION
 # ============================================
-doc.add_heading('Model Comparison', 1)
-
-comparison_table = doc.add_table(rows=5, cols=5)
-comparison_table.style = 'Light Grid Accent 1'
-comparison_table.rows[0].cells[0].text = 'Model'
-comparison_table.rows[0].cells[1].text = 'Cost per Analysis'
-comparison_table.rows[0].cells[2].text = '1,000/month'
-comparison_table.rows[0].cells[3].text = '5,000/month'
-comparison_table.rows[0].cells[4].text = '10,000/month'
-for i in range(5):
-    comparison_table.rows[0].cells[i].paragraphs[0].runs[0].bold = True
-
-comparison_table.rows[1].cells[0].text = 'Gemini 2.0 Flash'
-comparison_table.rows[1].cells[1].text = '$0.00132'
-comparison_table.rows[1].cells[2].text = '$1.32'
-comparison_table.rows[1].cells[3].text = '$6.60'
-comparison_table.rows[1].cells[4].text = '$13.20'
-
-comparison_table.rows[2].cells[0].text = 'Gemini 3 Flash'
-comparison_table.rows[2].cells[1].text = '$0.00940'
-comparison_table.rows[2].cells[2].text = '$9.40'
-comparison_table.rows[2].cells[3].text = '$47.00'
-comparison_table.rows[2].cells[4].text = '$94.00'
-
-comparison_table.rows[3].cells[0].text = 'Difference'
-comparison_table.rows[3].cells[1].text = '7.1x more'
-comparison_table.rows[3].cells[2].text = '7.1x more'
-comparison_table.rows[3].cells[3].text = '7.1x more'
-comparison_table.rows[3].cells[4].text = '7.1x more'
-for i in range(5):
-    comparison_table.rows[3].cells[i].paragraphs[0].runs[0].bold = True
-
-comparison_table.rows[4].cells[0].text = 'Annual Savings (2.0 vs 3.0)'
-comparison_table.rows[4].cells[1].text = '-'
-comparison_table.rows[4].cells[2].text = '$97.44'
-comparison_table.rows[4].cells[3].text = '$484.80'
-comparison_table.rows[4].cells[4].text = '$969.60'
-for i in range(5):
-    comparison_table.rows[4].cells[i].paragraphs[0].runs[0].bold = True
-
-doc.add_paragraph()
+body_xml.append(heading_xml('Model Comparison', 1))
+
+flash_2, flash_3 = MODELS
+cost_2, cost_3 = cost_per_analysis(flash_2), cost_per_analysis(flash_3)
+ratio = cost_3 / cost_2
+annual_savings = [(cost_3 - cost_2) * count * 12 for count in MONTHLY_COUNTS]
+
+body_xml.append(table_xml([
+    ['Model', 'Cost per Analysis', '1,000/month', '5,000/month', '10,000/month'],
+    *(
+        [model['name'], f'${cost_per_analysis(model):.5f}',
+         *(f'${count * cost_per_analysis(model):,.2f}' for count in MONTHLY_COUNTS)]
+        for model in MODELS
+    ),
+    ['Difference'] + [f'{ratio:.1f}x more'] * (len(MONTHLY_COUNTS) + 1),
+    ['Annual Savings (2.0 vs 3.0)', '-'] + [f'${savings:,.2f}' for savings in annual_savings],
+], bold_rows={0, 3, 4}))
+
+body_xml.append(SPACER_XML)
 
 # Key Insights
-doc.add_heading('Key Insights', 2)
+body_xml.append(heading_xml('Key Insights', 2))
 insights = [
-    '• Gemini 2.0 Flash is approximately 7.1x more cost-effective than Gemini 3 Flash',
-    '• The primary cost difference comes from output token pricing ($0.40 vs $3.00 per million)',
-    '• For 10,000 monthly analyses, using Gemini 2.0 Flash saves $969.60 annually',
-    '• Both models use identical token counts per analysis (2,000 input + 2,800 output)',
+    f"• {flash_2['name']} is approximately {ratio:.1f}x more cost-effective than {flash_3['name']}",
+    f"• The primary cost difference comes from output token pricing "
+    f"(${flash_2['price_out']:.2f} vs ${flash_3['price_out']:.2f} per million)",
+    f"• For {MONTHLY_COUNTS[-1]:,} monthly analyses, using {flash_2['name']} saves ${annual_savings[-1]:,.2f} annually",
+    f'• Both models use identical token counts per analysis ({TOKENS_IN:,} input + {TOKENS_OUT:,} output)',
     '• Cost scales linearly with usage volume for both models'
 ]
 
-for insight in insights:
-    p = doc.add_paragraph(insight, style='List Bullet')
-    p.runs[0].font.size = Pt(11)
+body_xml.append(bullets_xml(insights, BODY_SIZE))
 
-doc.add_paragraph()
+body_xml.append(SPACER_XML)
 
 # Notes
-doc.add_heading('Important Notes', 2)
+body_xml.append(heading_xml('Important Notes', 2))
 notes = [
     '• Pricing is based on Google Vertex AI rates as of January 2025',
     '• Token estimates assume standard boat images (1024x1024 resolution)',
-    '• Output token count assumes detailed JSON analysis responses (~2,800 tokens)',
+    f'• Output token count assumes detailed JSON analysis responses (~{TOKENS_OUT:,} tokens)',
     '• Actual costs may vary based on image resolution, prompt complexity, and response length',
     '• These calculations do not include any free tier credits or promotional pricing',
     '• Monitor actual token usage in production to refine cost estimates'
 ]
 
-for note in notes:
-    p = doc.add_paragraph(note, style='List Bullet')
-    p.runs[0].font.size = Pt(10)
-    p.runs[0].font.color.rgb = RGBColor(100, 100, 100)
+body_xml.append(bullets_xml(notes, NOTE_SIZE, GREY_TEXT))
 
 # Footer
-doc.add_paragraph()
-footer = doc.add_paragraph('Generated: January 2025 | BoataniQ Cost Analysis')
-footer.alignment = WD_ALIGN_PARAGRAPH.CENTER
-footer.runs[0].font.size = Pt(9)
-footer.runs[0].font.color.rgb = RGBColor(150, 150, 150)
+body_xml.append(SPACER_XML)
+body_xml.append(paragraph_xml(
+    'Generated: January 2025 | BoataniQ Cost Analysis',
+    center=True,
+    rpr=rpr_xml(size=FOOTER_SIZE, color=GREY_FOOTER),
+))
+
+add_blocks(''.join(body_xml))
 
 # Save document
 output_path = 'BoataniQ_AI_Model_Cost_Analysis.docx'
@@ -7,6 +7,7 @@ for comparison with boat market performance
 import yfinance as yf
 import pandas as pd
 from datetime import datetime, timedelta
+import os
 import time
 from typing import Dict, List, Optional
 import logging
@@ -18,7 +19,13 @@ logger = logging.getLogger(__name__)
 class FinancialIndicesFetcher:
     """Fetches and processes financial indices data"""
     
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Initialize the fetcher
+
+        Args:
+            cache_dir: Directory for on-disk price history (shared by workers and restarts)
+        """
         self.indices = {
             'SP500': '^GSPC',  # S&P 500
             'NASDAQ': '^IXIC',  # Nasdaq Composite
@@ -26,6 +33,50 @@ class FinancialIndicesFetcher:
         }
         self.cache = {}
         self.cache_duration = timedelta(hours=1)  # Cache for 1 hour
+        self.cache_dir = cache_dir or os.getenv('FINANCIAL_CACHE_DIR', 'financial_cache')
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"On-disk index cache disabled: {e}")
+            self.cache_dir = None
+    
+    def _cache_path(self, index_symbol: str, period: str) -> Optional[str]:
+        """Pickle file holding the price history for one symbol and period"""
+        if self.cache_dir is None:
+            return None
+        safe_symbol = ''.join(c if c.isalnum() else '_' for c in index_symbol)
+        return os.path.join(self.cache_dir, f"{safe_symbol}_{period}.pkl")
+    
+    def _read_cached(self, path: Optional[str], max_age: Optional[timedelta]) -> Optional[pd.DataFrame]:
+        """Cached price history, or None if missing, unreadable or older than max_age"""
+        if path is None:
+            return None
+        if max_age is not None and not self._is_fresh(path, max_age):
+            return None
+        try:
+            return pd.read_pickle(path)
+        except Exception:
+            return None
+    
+    def _is_fresh(self, path: Optional[str], max_age: timedelta) -> bool:
+        """Whether a cached file exists and is younger than max_age"""
+        if path is None:
+            return False
+        try:
+            return time.time() - os.path.getmtime(path) <= max_age.total_seconds()
+        except OSError:
+            return False
+    
+    def _write_cached(self, path: Optional[str], data: pd.DataFrame):
+        """Store price history atomically so concurrent readers never see a partial file"""
+        if path is None:
+            return
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            data.to_pickle(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not cache index data at {path}: {e}")
     
     def fetch_index_data(self, index_symbol: str, period: str = "5y") -> Optional[pd.DataFrame]:
         """
@@ -38,18 +89,31 @@ class FinancialIndicesFetcher:
         Returns:
             DataFrame with historical prices or None if error
         """
+        cache_path = self._cache_path(index_symbol, period)
+        cached = self._read_cached(cache_path, self.cache_duration)
+        if cached is not None:
+            return cached
+        
         try:
             ticker = yf.Ticker(index_symbol)
             data = ticker.history(period=period)
             
             if data.empty:
                 logger.warning(f"No data returned for {index_symbol}")
-                return None
+                return self._stale_fallback(cache_path, index_symbol)
             
+            self._write_cached(cache_path, data)
             return data
         except Exception as e:
             logger.error(f"Error fetching data for {index_symbol}: {e}")
-            return None
+            return self._stale_fallback(cache_path, index_symbol)
+    
+    def _stale_fallback(self, cache_path: Optional[str], index_symbol: str) -> Optional[pd.DataFrame]:
+        """Expired cached history for when the upstream fetch fails"""
+        stale = self._read_cached(cache_path, None)
+        if stale is not None:
+            logger.warning(f"Serving stale cached data for {index_symbol}")
+        return stale
     
     def calculate_returns(self, data: pd.DataFrame, start_date: Optional[str] = None) -> Dict:
         """
@@ -141,7 +205,8 @@ class FinancialIndicesFetcher:
                     results[index_name] = cached_data
                     continue
             
-            # Fetch data
+            # Fetch data (only a network fetch needs the rate-limit delay below)
+            from_disk = self._is_fresh(self._cache_path(symbol, period), self.cache_duration)
             data = self.fetch_index_data(symbol, period)
             
             if data is not None:
@@ -162,7 +227,8 @@ class FinancialIndicesFetcher:
                 }
             
             # Small delay to avoid rate limiting
-            time.sleep(0.5)
+            if not from_disk:
+                time.sleep(0.5)
         
         return results
     
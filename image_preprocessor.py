@@ -14,9 +14,49 @@ import cv2
 import numpy as np
 from PIL import Image, ImageEnhance, ImageFilter
 import io
-from typing import Tuple, Optional, Dict
+from typing import Tuple, Optional, Dict, Union, BinaryIO
 import time
 import math
+import os
+import re
+
+# Raw encoded image: bytes, a binary file object, or a buffer from load_image_buffer
+ImageData = Union[bytes, BinaryIO, np.ndarray]
+
+# Shared by the Gemini and Vertex AI analyzers
+# Long edge sent to Gemini; larger images only add image tokens and upload time
+MAX_IMAGE_DIM = int(os.getenv('BOATANIQ_MAX_IMAGE_DIM', '1024'))
+YEAR_RE = re.compile(r'\b(19|20)\d{2}\b')
+
+
+def prepare_image(image: Image.Image, max_dim: int = MAX_IMAGE_DIM) -> Image.Image:
+    """Image in RGB, downscaled to max_dim on the long edge"""
+    # Let the JPEG decoder scale down while decoding (no-op for other formats or once loaded)
+    scale = max_dim / max(image.size)
+    if scale < 1:
+        image.draft('RGB', (math.ceil(image.width * scale), math.ceil(image.height * scale)))
+    
+    # Convert to RGB if necessary
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    
+    # Downscale in place, keeping the aspect ratio (no-op for small images)
+    image.thumbnail((max_dim, max_dim), Image.LANCZOS)
+    return image
+
+
+def keyword_pattern(keywords: Tuple[str, ...]) -> re.Pattern:
+    """One regex matching any of the keywords, for first_keyword"""
+    return re.compile('|'.join(map(re.escape, keywords)))
+
+
+def first_keyword(text_lower: str, keywords: Tuple[str, ...], pattern: re.Pattern) -> Optional[str]:
+    """Highest-priority keyword found in text_lower (one regex scan), or None"""
+    found = set(pattern.findall(text_lower))
+    for keyword in keywords:
+        if keyword in found:
+            return keyword
+    return None
 
 
 class ImagePreprocessor:
@@ -34,12 +74,12 @@ class ImagePreprocessor:
         self.MIN_BRIGHTNESS = 25  # Minimum average brightness (more lenient)
         self.MAX_BRIGHTNESS = 255  # Maximum average brightness (allows all valid images including screenshots)
     
-    def validate_image_quality(self, image_bytes: bytes) -> Dict:
+    def validate_image_quality(self, image_bytes: ImageData) -> Dict:
         """
         Comprehensive image quality validation for production use
         
         Args:
-            image_bytes: Image data as bytes
+            image_bytes: Image data as bytes, a binary file object or a buffer from load_image_buffer
             
         Returns:
             Dictionary with validation results and quality scores
@@ -59,7 +99,7 @@ class ImagePreprocessor:
         
         try:
             # Convert bytes to numpy array
-            nparr = np.frombuffer(image_bytes, np.uint8)
+            nparr = self.load_image_buffer(image_bytes)
             img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
             
             if img is None:
@@ -152,13 +192,13 @@ class ImagePreprocessor:
             validation_result['issues'].append(f'Error during validation: {str(e)}')
             return validation_result
     
-    def detect_boat_mathematical(self, image_bytes: bytes) -> Dict:
+    def detect_boat_mathematical(self, image_bytes: ImageData) -> Dict:
         """
         Mathematical boat detection using computer vision techniques
         Detects boat-like shapes, water, and marine environment
         
         Args:
-            image_bytes: Image data as bytes
+            image_bytes: Image data as bytes, a binary file object or a buffer from load_image_buffer
             
         Returns:
             Dictionary with boat detection confidence and analysis
@@ -173,7 +213,7 @@ class ImagePreprocessor:
         
         try:
             # Convert bytes to numpy array
-            nparr = np.frombuffer(image_bytes, np.uint8)
+            nparr = self.load_image_buffer(image_bytes)
             img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
             
             if img is None:
@@ -257,13 +297,13 @@ class ImagePreprocessor:
             detection_result['issues'].append(f'Error during boat detection: {str(e)}')
             return detection_result
     
-    def validate_boat_image(self, image_bytes: bytes) -> Dict:
+    def validate_boat_image(self, image_bytes: ImageData) -> Dict:
         """
         Complete validation: quality + boat detection
         Production-level validation before processing
         
         Args:
-            image_bytes: Image data as bytes
+            image_bytes: Image data as bytes, a binary file object or a buffer from load_image_buffer
             
         Returns:
             Dictionary with complete validation results
@@ -278,8 +318,11 @@ class ImagePreprocessor:
             'warnings': []
         }
         
+        # Read the image once and share the buffer between both checks
+        nparr = self.load_image_buffer(image_bytes)
+        
         # 1. Quality validation
-        quality_result = self.validate_image_quality(image_bytes)
+        quality_result = self.validate_image_quality(nparr)
         validation['quality_validation'] = quality_result
         
         if not quality_result['is_valid']:
@@ -287,7 +330,7 @@ class ImagePreprocessor:
             return validation
         
         # 2. Boat detection
-        boat_result = self.detect_boat_mathematical(image_bytes)
+        boat_result = self.detect_boat_mathematical(nparr)
         validation['boat_detection'] = boat_result
         
         # 3. Combined assessment
@@ -314,12 +357,12 @@ class ImagePreprocessor:
         
         return validation
     
-    def preprocess_image(self, image_bytes: bytes, enhance_quality: bool = True) -> Tuple[bytes, dict]:
+    def preprocess_image(self, image_bytes: ImageData, enhance_quality: bool = True) -> Tuple[bytes, dict]:
         """
         Preprocess image to improve quality for AI recognition
         
         Args:
-            image_bytes: Original image as bytes
+            image_bytes: Original image as bytes, a binary file object or a buffer from load_image_buffer
             enhance_quality: Whether to apply quality enhancements
             
         Returns:
@@ -329,12 +372,12 @@ class ImagePreprocessor:
         
         try:
             # Convert bytes to numpy array
-            nparr = np.frombuffer(image_bytes, np.uint8)
+            nparr = self.load_image_buffer(image_bytes)
             img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
             
             if img is None:
                 # Try with PIL as fallback
-                pil_img = Image.open(io.BytesIO(image_bytes))
+                pil_img = Image.open(io.BytesIO(nparr))
                 img = cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2BGR)
             
             original_shape = img.shape
@@ -356,7 +399,7 @@ class ImagePreprocessor:
             
             processing_time = time.time() - start_time
             preprocessing_info['processing_time_ms'] = round(processing_time * 1000, 2)
-            preprocessing_info['original_size_bytes'] = len(image_bytes)
+            preprocessing_info['original_size_bytes'] = int(nparr.size)
             preprocessing_info['processed_size_bytes'] = len(processed_bytes)
             
             return processed_bytes, preprocessing_info
@@ -364,12 +407,40 @@ class ImagePreprocessor:
         except Exception as e:
             print(f"⚠️ [PREPROCESS] Error during preprocessing: {e}")
             # Return original image if preprocessing fails
+            if not isinstance(image_bytes, (bytes, bytearray)):
+                image_bytes = self.load_image_buffer(image_bytes).tobytes()
             return image_bytes, {
                 'error': str(e),
                 'enhancements_applied': ['error_fallback'],
                 'processing_time_ms': round((time.time() - start_time) * 1000, 2)
             }
     
+    def load_image_buffer(self, image: ImageData) -> np.ndarray:
+        """Read image data from bytes or a binary file object into a uint8 buffer
+        
+        Buffers are returned as-is, so callers can read an upload once and pass
+        the result to several validation and preprocessing steps.
+        """
+        if isinstance(image, np.ndarray):
+            return image
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            return np.frombuffer(image, np.uint8)
+        
+        # Read straight into a numpy buffer so no intermediate bytes copy is made
+        image.seek(0, io.SEEK_END)
+        size = image.tell()
+        image.seek(0)
+        buffer = np.empty(size, np.uint8)
+        view = memoryview(buffer)
+        read = 0
+        while read < size:
+            n = image.readinto(view[read:])
+            if not n:
+                break
+            read += n
+        image.seek(0)
+        return buffer[:read]
+    
     def _apply_enhancements(self, img: np.ndarray) -> Tuple[np.ndarray, list]:
         """
         Apply various image enhancements - optimized for speed
@@ -0,0 +1,29 @@
+"""
+Shared fixtures for the app.py tests
+"""
+
+import os
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope='module')
+def app_module(tmp_path_factory):
+    # The app loads its data relative to the working directory at import time
+    previous_cwd = os.getcwd()
+    os.environ.setdefault('ANALYSIS_CACHE_DB', str(tmp_path_factory.mktemp('cache') / 'analysis_cache.sqlite3'))
+    os.chdir(REPO_ROOT)
+    try:
+        import app
+        yield app
+    finally:
+        os.chdir(previous_cwd)
+
+
+@pytest.fixture
+def client(app_module):
+    if app_module.boat_db is None:
+        pytest.skip('boat database not available')
+    return app_module.app.test_client()
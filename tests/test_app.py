@@ -0,0 +1,110 @@
+"""
+Tests for the conditional GET (304) handling in app.py
+"""
+
+import gzip
+from datetime import timedelta
+
+from werkzeug.http import http_date
+
+
+def test_boat_data_endpoint_answers_if_modified_since(client, app_module):
+    first = client.get('/api/filter-options')
+    last_modified = first.headers['Last-Modified']
+    
+    second = client.get('/api/filter-options', headers={'If-Modified-Since': last_modified})
+    
+    assert first.status_code == 200
+    assert last_modified == http_date(app_module.boat_db.last_modified)
+    assert second.status_code == 304
+    assert second.data == b''
+
+
+def test_boat_data_endpoint_modified_since_older_date_gets_full_body(client, app_module):
+    older = http_date(app_module.boat_db.last_modified - timedelta(seconds=1))
+    
+    response = client.get('/api/filter-options', headers={'If-Modified-Since': older})
+    
+    assert response.status_code == 200
+    assert response.headers['Last-Modified'] == http_date(app_module.boat_db.last_modified)
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since(client, app_module):
+    current = http_date(app_module.boat_db.last_modified)
+    
+    stale = client.get('/api/map/boats?limit=100', headers={'If-None-Match': 'W/"stale"',
+                                                             'If-Modified-Since': current})
+    fresh = client.get('/api/map/boats?limit=100', headers={'If-None-Match': stale.headers['ETag'],
+                                                             'If-Modified-Since': current})
+    
+    assert stale.status_code == 200
+    assert stale.data
+    assert fresh.status_code == 304
+
+
+def test_if_modified_since_ignored_outside_boat_data_endpoints(client, app_module):
+    newer = http_date(app_module.boat_db.last_modified + timedelta(days=1))
+    
+    response = client.get('/api/history', headers={'If-Modified-Since': newer})
+    
+    assert response.status_code == 200
+    assert 'Last-Modified' not in response.headers
+
+
+def test_financial_response_compresses_only_when_accepted(app_module, monkeypatch):
+    compress_calls = []
+    real_compress = gzip.compress
+    
+    def counting_compress(data, *args, **kwargs):
+        compress_calls.append(len(data))
+        return real_compress(data, *args, **kwargs)
+    
+    monkeypatch.setattr(app_module.gzip, 'compress', counting_compress)
+    obj = {'success': True, 'data': {'indices': {'SP500': {'total_return_pct': 12.5}}}}
+    
+    with app_module.app.test_request_context('/'):
+        identity = app_module.financial_response(obj)
+    with app_module.app.test_request_context('/', headers={'If-None-Match': identity.headers['ETag'],
+                                                           'Accept-Encoding': 'gzip'}):
+        not_modified = app_module.financial_response(obj)
+    assert compress_calls == []
+    
+    with app_module.app.test_request_context('/', headers={'Accept-Encoding': 'gzip'}):
+        compressed = app_module.financial_response(obj)
+    
+    assert not_modified.status_code == 304
+    assert len(compress_calls) == 1
+    assert gzip.decompress(compressed.get_data()) == identity.get_data()
+    assert compressed.headers['ETag'] == identity.headers['ETag']
+
+
+def test_insights_summary_revalidates_with_etag(client):
+    first = client.get('/api/data-insights/summary')
+    
+    second = client.get('/api/data-insights/summary', headers={'If-None-Match': first.headers['ETag']})
+    
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert second.data == b''
+
+
+def test_model_info_is_built_once_per_analyzer(client, app_module, monkeypatch):
+    class Analyzer:
+        calls = 0
+        
+        def get_model_info(self):
+            Analyzer.calls += 1
+            return {'model_name': 'test-model'}
+    
+    monkeypatch.setattr(app_module, 'ai_analyzer', Analyzer())
+    app_module.model_info_payload.cache_clear()
+    
+    first = client.get('/api/model-info')
+    second = client.get('/api/model-info', headers={'If-None-Match': first.headers['ETag']})
+    third = client.get('/api/model-info')
+    app_module.model_info_payload.cache_clear()
+    
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert third.data == first.data
+    assert Analyzer.calls == 1
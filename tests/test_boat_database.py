@@ -0,0 +1,147 @@
+"""
+Tests for BoatDatabase searches
+"""
+
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+from geopy.distance import geodesic
+
+import boat_database
+from boat_database import BoatDatabase
+
+CSV_HEADER = 'title,price,dimensions,engine_performance,year_built\n'
+
+# Three brand candidates that tie for the query 'bavaria', listed out of order
+TIED_BRAND_ROWS = [
+    'Bavaria Vision 46,"EUR 310.000,-",14.27 x 4.35 m,1 x 110 HP / 81 kW,2018',
+    'Bavaria Match 42,"EUR 95.000,-",12.80 x 3.90 m,1 x 40 HP / 29 kW,2006',
+    'Bavaria Cruiser 34,"EUR 89.000,-",10.30 x 3.42 m,1 x 30 HP / 22 kW,2015',
+    'Jeanneau Sun Odyssey 349,"EUR 120.000,-",10.34 x 3.44 m,1 x 30 HP / 22 kW,2017',
+]
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / 'boats.csv'
+    path.write_text(CSV_HEADER + '\n'.join(TIED_BRAND_ROWS) + '\n', encoding='utf-8')
+    return str(path)
+
+
+def test_brand_candidates_are_sorted_and_unique(csv_path):
+    db = BoatDatabase(csv_path)
+    
+    assert db._brand_candidates == sorted(set(db._brand_candidates))
+
+
+def test_brand_search_breaks_ties_alphabetically(csv_path):
+    db = BoatDatabase(csv_path)
+    
+    results = db.search_by_brand('bavaria', limit=1)
+    
+    assert [boat['title'] for boat in results] == ['Bavaria Cruiser 34']
+
+
+def test_brand_search_ranking_does_not_depend_on_hash_seed(csv_path):
+    script = (
+        'import sys\n'
+        'from boat_database import BoatDatabase\n'
+        'db = BoatDatabase(sys.argv[1])\n'
+        'print([boat["title"] for boat in db.search_by_brand("bavaria", limit=3)])\n'
+    )
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    outputs = set()
+    for seed in ('1', '2', '3', '4'):
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        result = subprocess.run(
+            [sys.executable, '-W', 'ignore', '-c', script, csv_path],
+            cwd=repo_root, env=env, capture_output=True, text=True, check=True
+        )
+        outputs.add(result.stdout.strip().splitlines()[-1])
+    
+    assert len(outputs) == 1
+
+
+def reference_location_search(db, lat, lon, radius_km, limit):
+    """The original full scan: exact geodesic distance to every boat"""
+    nearby = []
+    for _, boat in db.boats_df.iterrows():
+        if pd.notna(boat['location_lat']) and pd.notna(boat['location_lon']):
+            distance = geodesic((lat, lon), (boat['location_lat'], boat['location_lon'])).kilometers
+            if distance <= radius_km:
+                nearby.append((boat['title'], round(distance, 2)))
+    nearby.sort(key=lambda item: item[1])
+    return nearby[:limit]
+
+
+@pytest.fixture(scope='module')
+def located_db(tmp_path_factory):
+    """Boats scattered over the globe, clustered near the antimeridian and both poles"""
+    rng = np.random.default_rng(0)
+    points = [
+        (0.0, 179.95), (0.0, -179.95), (-17.7, 179.99), (-17.7, -179.99),
+        (89.9, 0.0), (89.9, 180.0), (89.5, -90.0), (-89.95, 45.0), (-89.5, -135.0),
+        (43.7384, 7.4246), (43.7384, 7.4246), (43.5804, 7.1258),
+    ]
+    points += [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(150)]
+    points += [(rng.uniform(85, 90), rng.uniform(-180, 180)) for _ in range(30)]
+    points += [(rng.uniform(-10, 10), rng.choice([-1, 1]) * rng.uniform(178, 180)) for _ in range(30)]
+    
+    lines = [CSV_HEADER.strip() + ',location_name,location_lat,location_lon,location_country']
+    for number, (lat, lon) in enumerate(points):
+        lines.append(f'Boat {number},"EUR 1.000,-",5.00 x 2.00 m,1 x 10 HP / 7 kW,2000,Spot {number},{lat},{lon},Nowhere')
+    lines.append('Boat without location,"EUR 1.000,-",5.00 x 2.00 m,1 x 10 HP / 7 kW,2000,,,,')
+    
+    path = tmp_path_factory.mktemp('located') / 'boats.csv'
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return BoatDatabase(str(path))
+
+
+@pytest.mark.parametrize('lat, lon, radius_km', [
+    (43.7384, 7.4246, 50),        # ordinary search, duplicate coordinates
+    (43.7384, 7.4246, 0),         # zero radius still finds boats at the exact point
+    (0.0, 180.0, 50),             # on the antimeridian
+    (0.0, -179.99, 500),          # box wraps from west to east
+    (-17.7, 179.9, 200),
+    (89.99, 30.0, 300),           # near the north pole, every longitude qualifies
+    (90.0, 0.0, 100),             # at the pole itself
+    (88.5, -170.0, 200),          # box reaches past 89 degrees
+    (-89.9, 100.0, 500),          # near the south pole
+    (60.0, 10.0, 5000),           # longitude margin wider than a hemisphere
+    (10.0, -50.0, 25000),         # larger than any distance on earth
+])
+def test_location_search_matches_full_geodesic_scan(located_db, lat, lon, radius_km):
+    results = located_db.search_by_location(lat, lon, radius_km=radius_km, limit=1000)
+    
+    assert [(boat['title'], boat['distance_km']) for boat in results] == \
+        reference_location_search(located_db, lat, lon, radius_km, limit=1000)
+
+
+def test_location_search_applies_limit_after_sorting(located_db):
+    results = located_db.search_by_location(0.0, 180.0, radius_km=2000, limit=5)
+    
+    assert [(boat['title'], boat['distance_km']) for boat in results] == \
+        reference_location_search(located_db, 0.0, 180.0, 2000, limit=5)
+
+
+def test_location_search_without_matches_returns_empty_list(located_db):
+    assert located_db.search_by_location(-40.0, -100.0, radius_km=1) == []
+
+
+def test_location_search_refines_only_bounding_box_candidates(located_db, monkeypatch):
+    refined = []
+    
+    def counting_geodesic(origin, point):
+        refined.append(point)
+        return geodesic(origin, point)
+    
+    monkeypatch.setattr(boat_database, 'geodesic', counting_geodesic)
+    results = located_db.search_by_location(43.7384, 7.4246, radius_km=50)
+    
+    # Two distinct coordinates near Monaco (one shared by two boats) out of ~220 points
+    assert sorted(refined) == [(43.5804, 7.1258), (43.7384, 7.4246)]
+    assert len(results) == 3
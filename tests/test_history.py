@@ -0,0 +1,144 @@
+"""
+Tests for the analysis history shared between gunicorn workers in app.py
+"""
+
+import uuid
+
+import orjson
+import pytest
+
+
+@pytest.fixture
+def history(app_module, tmp_path, monkeypatch):
+    """Point the history writer at an empty file for the duration of a test"""
+    app_module.stop_history_writer()
+    monkeypatch.setattr(app_module, 'HISTORY_FILE', str(tmp_path / 'analysis_history.jsonl'))
+    monkeypatch.setattr(app_module, 'HISTORY_PENDING', {})
+    monkeypatch.setattr(app_module, 'HISTORY_PENDING_DELETES', set())
+    monkeypatch.setattr(app_module, 'history_file_state', None)
+    monkeypatch.setattr(app_module, 'history_writes', 0)
+    app_module.start_history_writer()
+    yield app_module
+    app_module.stop_history_writer()
+    monkeypatch.undo()
+    app_module.start_history_writer()
+
+
+def flush(app_module):
+    """Wait for everything queued so far to reach the file"""
+    app_module.stop_history_writer()
+    app_module.start_history_writer()
+
+
+def append_from_other_worker(app_module, *records):
+    """Write records the way another process's history writer would"""
+    with open(app_module.HISTORY_FILE, 'ab') as f:
+        for record in records:
+            f.write(orjson.dumps(record) + b'\n')
+
+
+def stored_records(app_module):
+    with open(app_module.HISTORY_FILE, 'rb') as f:
+        return [orjson.loads(line) for line in f]
+
+
+def make_entry(summary):
+    return {'id': str(uuid.uuid4()), 'timestamp': '2024-01-01T00:00:00', 'summary': summary}
+
+
+def test_entry_written_by_another_worker_is_found(history):
+    other = make_entry('other worker')
+    append_from_other_worker(history, other)
+    client = history.app.test_client()
+
+    by_id = client.get(f"/api/history/{other['id']}")
+    listing = client.get('/api/history')
+
+    assert by_id.status_code == 200
+    assert orjson.loads(by_id.data)['analysis'] == other
+    assert orjson.loads(listing.data)['history'] == [other]
+
+
+def test_unflushed_entry_is_listed_before_file_entries(history):
+    append_from_other_worker(history, make_entry('older'))
+    history.stop_history_writer()  # Keep the next entry pending
+
+    entry = history.add_analysis_to_history({'summary': 'newer'})
+
+    assert [item['summary'] for item in history.current_history()] == ['newer', 'older']
+    assert history.find_history_entry(entry['id']) is entry
+    history.start_history_writer()
+
+
+def test_compaction_keeps_entries_from_other_workers(history):
+    local = history.add_analysis_to_history({'summary': 'local'})
+    flush(history)
+    other = make_entry('other worker')
+    append_from_other_worker(history, other)
+
+    with history.history_lock:
+        history.compact_analysis_history()
+    flush(history)
+
+    assert [record['id'] for record in stored_records(history)] == [local['id'], other['id']]
+
+
+def test_compaction_applies_delete_markers_from_other_workers(history):
+    local = history.add_analysis_to_history({'summary': 'local'})
+    kept = history.add_analysis_to_history({'summary': 'kept'})
+    flush(history)
+    append_from_other_worker(history, {'deleted_id': local['id']})
+
+    with history.history_lock:
+        history.compact_analysis_history()
+    flush(history)
+
+    assert [record['id'] for record in stored_records(history)] == [kept['id']]
+    assert history.find_history_entry(local['id']) is None
+
+
+def test_compaction_trims_to_history_limit(history, monkeypatch):
+    monkeypatch.setattr(history, 'HISTORY_LIMIT', 3)
+    entries = [make_entry(str(i)) for i in range(5)]
+    append_from_other_worker(history, *entries)
+
+    with history.history_lock:
+        history.compact_analysis_history()
+    flush(history)
+
+    assert stored_records(history) == entries[-3:]
+
+
+def test_delete_entry_written_by_another_worker(history):
+    other = make_entry('other worker')
+    append_from_other_worker(history, other)
+    client = history.app.test_client()
+
+    deleted = client.delete(f"/api/history/{other['id']}")
+    flush(history)
+
+    assert deleted.status_code == 200
+    assert stored_records(history)[-1] == {'deleted_id': other['id']}
+    assert client.get(f"/api/history/{other['id']}").status_code == 404
+    assert orjson.loads(client.get('/api/history').data)['history'] == []
+
+
+def test_delete_unflushed_entry_is_hidden_immediately(history):
+    history.stop_history_writer()  # Keep the entry and its marker pending
+    entry = history.add_analysis_to_history({'summary': 'local'})
+    client = history.app.test_client()
+
+    deleted = client.delete(f"/api/history/{entry['id']}")
+
+    assert deleted.status_code == 200
+    assert client.get(f"/api/history/{entry['id']}").status_code == 404
+    assert history.current_history() == []
+    history.start_history_writer()
+
+
+def test_delete_unknown_id_is_not_found(history):
+    response = history.app.test_client().delete(f'/api/history/{uuid.uuid4()}')
+    flush(history)
+
+    assert response.status_code == 404
+    assert stored_records(history) == []
@@ -0,0 +1,37 @@
+"""
+Tests for the pre-serialized /api/map/boats payloads (ETag revalidation and gzip)
+"""
+
+import gzip
+
+import orjson
+
+
+def test_map_boats_revalidates_with_etag(client):
+    first = client.get('/api/map/boats?limit=100')
+    etag = first.headers['ETag']
+    
+    second = client.get('/api/map/boats?limit=100', headers={'If-None-Match': etag})
+    
+    assert first.status_code == 200
+    assert etag.startswith('W/')
+    assert second.status_code == 304
+    assert second.data == b''
+    assert second.headers['ETag'] == etag
+
+
+def test_map_boats_stale_etag_gets_full_body(client):
+    response = client.get('/api/map/boats?limit=100', headers={'If-None-Match': 'W/"stale"'})
+    
+    assert response.status_code == 200
+    assert orjson.loads(response.data)['success'] is True
+
+
+def test_map_boats_gzip_body_matches_identity_body(client):
+    identity = client.get('/api/map/boats?limit=100')
+    compressed = client.get('/api/map/boats?limit=100', headers={'Accept-Encoding': 'gzip'})
+    
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in compressed.headers['Vary']
+    assert gzip.decompress(compressed.data) == identity.data
+    assert compressed.headers['ETag'] == identity.headers['ETag']
@@ -0,0 +1,10 @@
+"""
+WSGI entry point for BoataniQ
+Threaded gunicorn workers let slow Vertex AI / Gemini calls overlap:
+    gunicorn wsgi:app --worker-class gthread --workers 2 --threads 8 --timeout 120
+"""
+
+from app import app
+
+if __name__ == '__main__':
+    app.run()